@@ -0,0 +1,173 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from constants import datasets
+
+# ------------------------------
+# Cache location and mode
+# ------------------------------
+# DT_DATA_CACHE moves the cache (e.g. to a shared volume); DT_OFFLINE=1
+# forbids any download, so a missing cache entry is an error
+CACHE_DIR = os.environ.get("DT_DATA_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_cache"))
+OFFLINE = os.environ.get("DT_OFFLINE", "0") not in ("", "0", "false", "False")
+
+# Bump when the encoding changes so cached arrays are rebuilt
+ENCODING_VERSION = 2
+
+
+def _slug(dataset):
+    return dataset["name"].lower().replace(" ", "_").replace("(", "").replace(")", "")
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _check_pinned(dataset, digest, source):
+    """Enforces the digest pinned by a dataset entry, if it has one."""
+    pinned = dataset.get("sha256")
+    if pinned and digest != pinned:
+        raise ValueError(f"Checksum mismatch for {dataset['name']} ({source}): expected {pinned}, got {digest}")
+
+
+def fetch_raw(dataset, offline=None, cache_dir=None):
+    """
+    Returns the raw bytes of a constants.datasets entry, downloading them
+    once into the cache.
+
+    The SHA-256 of the download is recorded next to it and checked on
+    every later read. An entry may pin the expected digest with a
+    "sha256" key, which is then enforced on download and on every read
+    of the cache, including caches copied from another host.
+    """
+    offline = OFFLINE if offline is None else offline
+    folder = os.path.join(cache_dir or CACHE_DIR, _slug(dataset))
+    raw_path = os.path.join(folder, "raw.data")
+    meta_path = os.path.join(folder, "meta.json")
+
+    if os.path.exists(raw_path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(raw_path, "rb") as f:
+            raw = f.read()
+        if _sha256(raw) != meta["sha256"]:
+            raise ValueError(f"Cached copy of {dataset['name']} is corrupt ({raw_path}); delete it to re-download")
+        _check_pinned(dataset, meta["sha256"], raw_path)
+        return raw
+
+    if offline:
+        raise FileNotFoundError(f"{dataset['name']} is not cached in {folder} and offline mode is on")
+
+    with urllib.request.urlopen(dataset["url"], timeout=60) as response:
+        raw = response.read()
+    digest = _sha256(raw)
+    _check_pinned(dataset, digest, dataset["url"])
+
+    os.makedirs(folder, exist_ok=True)
+    with open(raw_path, "wb") as f:
+        f.write(raw)
+    with open(meta_path, "w") as f:
+        json.dump({"name": dataset["name"], "url": dataset["url"], "sha256": digest}, f, indent=2)
+    return raw
+
+
+def smallest_uint(n_values):
+    """Narrowest unsigned integer dtype that can hold codes 0..n_values-1."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n_values <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.uint64
+
+
+def _encode(raw, dataset, missing):
+    """
+    Encodes a raw file following the column types of its dataset entry.
+
+    Categorical columns become codes of their sorted string values (what
+    LabelEncoder on str gave) in the narrowest unsigned dtype. Numeric
+    columns stay numbers; with missing="keep" a '?' in them becomes NaN,
+    which never satisfies "<= threshold" and so always goes right.
+    X is one C-contiguous array: unsigned codes if every feature is
+    categorical, float64 otherwise.
+    """
+    if missing == "drop":
+        df = pd.read_csv(io.BytesIO(raw), names=dataset["cols"], na_values="?").dropna()
+    else:
+        df = pd.read_csv(io.BytesIO(raw), names=dataset["cols"])
+    numeric = set(dataset.get("numeric", ()))
+
+    columns = []
+    for c in df.columns:
+        if c in numeric:
+            columns.append(pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=np.float64))
+        else:
+            uniques, codes = np.unique(df[c].astype(str).to_numpy(), return_inverse=True)
+            columns.append(codes.reshape(-1).astype(smallest_uint(len(uniques))))
+
+    features = [col for c, col in zip(df.columns, columns) if c != "class"]
+    if any(col.dtype.kind == "f" for col in features):
+        dtype = np.float64
+    else:
+        dtype = np.result_type(*[col.dtype for col in features])
+    X = np.ascontiguousarray(np.column_stack(features), dtype=dtype)
+    y = columns[list(df.columns).index("class")]
+    return X, y
+
+
+def load_dataset(dataset, missing="keep", offline=None, cache_dir=None):
+    """
+    Loads a constants.datasets entry as encoded (X, y) arrays with
+    compact dtypes (see _encode), ready for fit() without any casting.
+
+    Args:
+        dataset (dict): An entry of constants.datasets.
+        missing (str): "keep" treats '?' as an ordinary category,
+                       "drop" removes rows with a '?' value.
+        offline (bool): Never download; defaults to the DT_OFFLINE variable.
+        cache_dir (str): Cache root; defaults to DT_DATA_CACHE or ./data_cache.
+
+    The encoded arrays are stored as .npz next to the raw file, tagged
+    with the raw file's checksum, so repeat runs skip the network and
+    CSV parsing entirely.
+    """
+    if missing not in ("keep", "drop"):
+        raise ValueError(f"missing must be 'keep' or 'drop', got {missing!r}")
+    folder = os.path.join(cache_dir or CACHE_DIR, _slug(dataset))
+    meta_path = os.path.join(folder, "meta.json")
+    encoded_path = os.path.join(folder, f"encoded_{missing}.npz")
+
+    # Fast path: encoded arrays built from the raw file we have on record
+    if os.path.exists(encoded_path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            digest = json.load(f)["sha256"]
+        _check_pinned(dataset, digest, meta_path)
+        with np.load(encoded_path, allow_pickle=False) as cached:
+            if (str(cached["source_sha256"]) == digest
+                    and int(cached.get("encoding", 0)) == ENCODING_VERSION):
+                return cached["X"], cached["y"]
+
+    raw = fetch_raw(dataset, offline, cache_dir)
+    digest = _sha256(raw)
+    X, y = _encode(raw, dataset, missing)
+    np.savez(encoded_path, X=X, y=y, source_sha256=digest, encoding=ENCODING_VERSION)
+    return X, y
+
+# ------------------------------
+# MAIN — prefetch for offline hosts
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download and encode all datasets into the local cache.")
+    parser.add_argument("--cache-dir", default=None, help="cache root (default: DT_DATA_CACHE or ./data_cache)")
+    args = parser.parse_args()
+
+    for d in datasets:
+        for missing in ("keep", "drop"):
+            X, y = load_dataset(d, missing=missing, cache_dir=args.cache_dir)
+        print(f"{d['name']:35s} | {X.shape[0]} rows x {X.shape[1]} features (after dropping '?')")
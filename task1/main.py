@@ -1,7 +1,6 @@
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
 
 from criteria.dt_entropy import DT_Entropy
 from criteria.dt_gini import DT_Gini
@@ -11,6 +10,7 @@ from criteria.dt_hellinger import DT_Hellinger
 from criteria.dt_twoing import DT_Twoing
 
 from constants import datasets
+from dataset_store import load_dataset
 
 # -------------------------------------------------------------------------
 # Define all splitting-criterion models
@@ -28,13 +28,8 @@ models = [
 # -------------------------------------------------------------------------
 # Helper: load and encode categorical data
 # -------------------------------------------------------------------------
-def load_and_preprocess(url, cols):
-    df = pd.read_csv(url, names=cols)
-    le = LabelEncoder()
-    for c in df.columns:
-        df[c] = le.fit_transform(df[c].astype(str))
-    X = df.drop("class", axis=1, errors="ignore").values
-    y = df["class"].values
+def load_and_preprocess(dataset):
+    X, y = load_dataset(dataset)
     return train_test_split(X, y, test_size=0.3, random_state=42)
 
 
@@ -46,7 +41,7 @@ results = []
 for d in datasets:
     print(f"\n=== Dataset: {d['name']} ===")
     try:
-        X_train, X_test, y_train, y_test = load_and_preprocess(d["url"], d["cols"])
+        X_train, X_test, y_train, y_test = load_and_preprocess(d)
     except Exception as e:
         print(f"Skipping {d['name']} due to error: {e}")
         continue
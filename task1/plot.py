@@ -1,9 +1,7 @@
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
 import os
-import ssl
 import traceback
 
 # --- PLOTTING IMPORTS ---
@@ -11,18 +9,6 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 # ------------------------
 
-# --- FIX for SSL Certificate Error ---
-# This bypasses the certificate check for downloading datasets
-# (This was not in your main.py but is often needed)
-try:
-    _create_unverified_https_context = ssl._create_unverified_context
-except AttributeError:
-    # Legacy Python may not have this attr
-    pass
-else:
-    ssl._create_default_https_context = _create_unverified_https_context
-# -------------------------------------------------------------------
-
 # Import ONLY your base trees
 from criteria.dt_entropy import DT_Entropy
 from criteria.dt_gini import DT_Gini
@@ -33,6 +19,7 @@ from criteria.dt_twoing import DT_Twoing
 
 # Import datasets
 from constants import datasets
+from dataset_store import load_dataset
 
 # -------------------------------------------------------------------------
 # Define all splitting-criterion models
@@ -51,17 +38,10 @@ models = [
 # Helper: load and encode categorical data
 # (Copied from your main.py)
 # -------------------------------------------------------------------------
-def load_and_preprocess(url, cols):
+def load_and_preprocess(dataset):
     # Note: This version doesn't handle '?' missing values.
-    # If your datasets have '?', this may need to be updated to:
-    # df = pd.read_csv(url, names=cols, na_values='?')
-    # df = df.dropna()
-    df = pd.read_csv(url, names=cols)
-    le = LabelEncoder()
-    for c in df.columns:
-        df[c] = le.fit_transform(df[c].astype(str))
-    X = df.drop("class", axis=1, errors="ignore").values
-    y = df["class"].values
+    # Use load_dataset(dataset, missing="drop") to drop those rows.
+    X, y = load_dataset(dataset)
     return train_test_split(X, y, test_size=0.3, random_state=42)
 
 # -------------------------------------------------------------------------
@@ -125,7 +105,7 @@ if __name__ == "__main__":
     for d in datasets:
         print(f"\n=== Dataset: {d['name']} ===")
         try:
-            X_train, X_test, y_train, y_test = load_and_preprocess(d["url"], d["cols"])
+            X_train, X_test, y_train, y_test = load_and_preprocess(d)
             if len(y_train) < 20: # Add a check for tiny datasets
                 print(f"Skipping {d['name']} (dataset too small)")
                 continue
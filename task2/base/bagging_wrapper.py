@@ -2,38 +2,132 @@ import numpy as np
 from sklearn.utils import resample
 
 import numpy as np
+import time
 from collections import Counter
 from copy import deepcopy
 
+from base.dt_base import resolve_max_features, tree_signature
+from base.flat_tree import LEAF, FlatTree
+from base.introspection import model_summary
+from base.streaming import predict_chunks
+
+
+def _innermost_tree(estimator):
+    """Follows 'base_estimator' links down to the actual DecisionTreeBase."""
+    while hasattr(estimator, "base_estimator"):
+        estimator = estimator.base_estimator
+    return estimator
+
+
+def _remap_features(tree, features):
+    """
+    Rewrites the feature indices of a tree fitted on X[:, features]
+    so that it can be applied to rows with all original columns.
+    """
+    if not isinstance(tree, dict):
+        return tree
+    (feature, threshold), subtree = next(iter(tree.items()))
+    return {(int(features[feature]), threshold): {
+        'left': _remap_features(subtree['left'], features),
+        'right': _remap_features(subtree['right'], features)
+    }}
+
+
 class BaggingWrapper:
     """
     A wrapper class to implement Bagging (Bootstrap Aggregating)
     for any given base decision tree estimator.
+
+    Besides classic bagging it supports random patches: each tree can be
+    trained on a fraction of the rows (max_samples, with or without
+    replacement) and on a subset of the features (max_features), drawn
+    either once per tree (random subspaces) or at every split (random forest).
+
+    After fitting, structurally identical trees are stored once with a
+    multiplicity in 'estimator_weights' and votes are weighted accordingly,
+    which saves memory and prediction time without changing any prediction.
+
+    Every tree keeps the class counts of its nodes, so predict_proba()
+    (the weighted mean of the trees' leaf distributions) and apply() need
+    no extra traversal; voting="soft" predicts from those probabilities.
+
+    With an incrementally updatable base learner (e.g. HoeffdingTree),
+    partial_fit() does online bagging instead: every tree sees each new
+    example with a Poisson(1) weight, so updates cost time proportional
+    to the new data only.
     """
 
-    def __init__(self, base_estimator, n_estimators=100):
+    def __init__(self, base_estimator, n_estimators=100, max_samples=1.0,
+                 bootstrap=True, max_features=None, feature_sampling="tree",
+                 random_state=None, deduplicate=True, voting="hard"):
         """
         Initializes the Bagging wrapper.
-        
+
         Args:
-            base_estimator: An instance of your DecisionTreeBase class 
+            base_estimator: An instance of your DecisionTreeBase class
                             (e.g., DT_Entropy(), DT_Gini()).
             n_estimators (int): The number of trees (base estimators) to train.
+            max_samples (int or float): Rows drawn per tree, as a count or
+                                        as a fraction of the training set.
+            bootstrap (bool): Draw rows with replacement (True) or without.
+            max_features (None, int, float, "sqrt" or "log2"): Features
+                                        available to each tree or split.
+            feature_sampling (str): "tree" draws one feature subset per tree,
+                                    "split" lets the tree draw a new subset
+                                    at every node (random-forest mode).
+            random_state (int or None): Seed for reproducible ensembles.
+                                        None uses NumPy's global generator.
+            deduplicate (bool): Keep only one copy of identical trees.
+            voting (str): "hard" for majority voting on labels, "soft" for
+                          the most probable class under predict_proba.
         """
+        if feature_sampling not in ("tree", "split"):
+            raise ValueError(f"feature_sampling must be 'tree' or 'split', got {feature_sampling!r}")
+        if voting not in ("hard", "soft"):
+            raise ValueError(f"voting must be 'hard' or 'soft', got {voting!r}")
         self.base_estimator = base_estimator
         self.n_estimators = n_estimators
+        self.max_samples = max_samples
+        self.bootstrap = bootstrap
+        self.max_features = max_features
+        self.feature_sampling = feature_sampling
+        self.random_state = random_state
+        self.deduplicate = deduplicate
+        self.voting = voting
+        self.classes_ = None
+        self.n_features_in_ = None
         self.estimators = []
-        
+        self.estimator_weights = []
+        self._flat_trees = None
+        self._online = False
+
         # Use the name of the base estimator for reporting
         self.name = f"Bagged ({self.base_estimator.name})"
 
+    def __getstate__(self):
+        # Unseeded ensembles draw from the np.random module, which cannot
+        # be pickled; an unpickled copy simply draws from it again
+        state = self.__dict__.copy()
+        if state.get("_rng") is np.random:
+            state["_rng"] = None
+        return state
+
+    def __setstate__(self, state):
+        if state.get("_rng", np.random) is None:
+            state["_rng"] = np.random
+        self.__dict__.update(state)
+
     def _bootstrap_sample(self, X, y):
         """
-        Creates a bootstrap sample (sampling with replacement).
+        Creates a bootstrap sample (by default sampling with replacement).
         """
         n_samples = X.shape[0]
-        # Generate random indices with replacement
-        indices = np.random.choice(n_samples, size=n_samples, replace=True)
+        if isinstance(self.max_samples, float):
+            size = max(1, int(round(self.max_samples * n_samples)))
+        else:
+            size = int(self.max_samples)
+        # Generate random indices
+        indices = self._rng.choice(n_samples, size=size, replace=self.bootstrap)
         return X[indices], y[indices]
 
     def fit(self, X, y):
@@ -41,33 +135,263 @@ class BaggingWrapper:
         Fits 'n_estimators' copies of the base estimator on
         different bootstrap samples of the training data.
         """
+        if self.random_state is None:
+            self._rng = np.random
+        else:
+            self._rng = np.random.RandomState(self.random_state)
+        n_features = X.shape[1]
+        self.n_features_in_ = n_features
+        self.classes_ = np.unique(y)
+
         self.estimators = []
+        self.estimator_weights = []
+        self._flat_trees = None
+        self._online = False
         for _ in range(self.n_estimators):
             # Create a bootstrap sample
             X_sample, y_sample = self._bootstrap_sample(X, y)
-            
+
             # Create a deep copy of the base estimator
             estimator = deepcopy(self.base_estimator)
-            
+            tree_params = _innermost_tree(estimator)
+            if self.random_state is not None:
+                tree_params.random_state = self._rng.randint(np.iinfo(np.int32).max)
+
+            # Per-split subsampling is done by the tree itself,
+            # per-tree subsampling by fitting on a column subset
+            features = None
+            if self.max_features is not None:
+                if self.feature_sampling == "split":
+                    tree_params.max_features = self.max_features
+                else:
+                    k = resolve_max_features(self.max_features, n_features)
+                    features = np.sort(self._rng.choice(n_features, size=k, replace=False))
+                    X_sample = X_sample[:, features]
+
             # Fit the estimator on the sample
             estimator.fit(X_sample, y_sample)
-            
+
+            # Map the subspace tree back onto the full feature set
+            if features is not None:
+                estimator.tree = _remap_features(estimator.tree, features)
+                if hasattr(estimator, "tree_"):
+                    estimator.tree_ = estimator.tree
+
+            # A bootstrap sample may miss classes; use the ensemble's columns
+            self._align_classes(estimator)
+
             # Store the trained estimator
             self.estimators.append(estimator)
+            self.estimator_weights.append(1)
+
+        if self.deduplicate:
+            self._deduplicate()
+
+    def partial_fit(self, X, y):
+        """
+        Online bagging (Oza & Russell): updates every tree with the new
+        batch, each example weighted by an independent Poisson(1) draw per
+        tree, which mimics its multiplicity in a bootstrap sample of an
+        ever-growing training set.
+
+        The first call (or the first after fit()) starts a fresh ensemble
+        of 'n_estimators' copies of the base estimator, which must provide
+        partial_fit(X, y, sample_weight, classes). Online trees keep
+        learning, so they are never deduplicated, and feature subsampling
+        is not supported.
+        """
+        if not hasattr(self.base_estimator, "partial_fit"):
+            raise ValueError(f"{self.base_estimator.name} cannot be updated incrementally; use fit()")
+        if self.max_features is not None:
+            raise ValueError("partial_fit does not support max_features")
+        X = np.asarray(X)
+        y = np.asarray(y)
+
+        if not self._online:
+            if self.random_state is None:
+                self._rng = np.random
+            else:
+                self._rng = np.random.RandomState(self.random_state)
+            self.classes_ = np.unique(y)
+            self.n_features_in_ = X.shape[1]
+            self.estimators = []
+            for _ in range(self.n_estimators):
+                estimator = deepcopy(self.base_estimator)
+                if self.random_state is not None:
+                    _innermost_tree(estimator).random_state = self._rng.randint(np.iinfo(np.int32).max)
+                self.estimators.append(estimator)
+            self.estimator_weights = [1] * self.n_estimators
+            self._online = True
+        else:
+            self.classes_ = np.union1d(self.classes_, y)
+
+        # Passing the ensemble's classes keeps every tree's counts aligned
+        for estimator in self.estimators:
+            weights = self._rng.poisson(1.0, size=len(y))
+            estimator.partial_fit(X, y, sample_weight=weights, classes=self.classes_)
+        self._flat_trees = None
+
+    def _align_classes(self, estimator):
+        """Re-expresses an estimator's node class counts over self.classes_."""
+        if getattr(estimator, "node_counts_", None) is None:
+            return
+        counts = np.zeros((len(estimator.node_counts_), len(self.classes_)))
+        counts[:, np.searchsorted(self.classes_, estimator.classes_)] = estimator.node_counts_
+        estimator.node_counts_ = counts
+        estimator.classes_ = self.classes_
+
+    def _deduplicate(self):
+        """
+        Merges structurally identical trees into one entry whose weight is
+        their total multiplicity. First-occurrence order is kept, so
+        weighted voting breaks ties exactly like voting over all trees.
+        """
+        positions = {}
+        estimators, weights, members = [], [], []
+        for est, weight in zip(self.estimators, self.estimator_weights):
+            key = tree_signature(est.tree)
+            if key in positions:
+                weights[positions[key]] += weight
+                members[positions[key]].append((est, weight))
+            else:
+                positions[key] = len(estimators)
+                estimators.append(est)
+                weights.append(weight)
+                members.append([(est, weight)])
+
+        # Identical structure, so node counts line up. The kept tree gets the
+        # weighted mean of the members' class distributions (scaled by their
+        # pooled counts), so predict_proba equals the mean over all trees
+        for kept, group in zip(estimators, members):
+            if len(group) == 1 or getattr(kept, "node_counts_", None) is None:
+                continue
+            total_weight = sum(weight for _, weight in group)
+            mean = sum(weight * est.node_counts_ / est.node_counts_.sum(axis=1, keepdims=True)
+                       for est, weight in group) / total_weight
+            pooled = sum(est.node_counts_.sum(axis=1, keepdims=True) for est, _ in group)
+            kept.node_counts_ = mean * pooled
+        self.estimators = estimators
+        self.estimator_weights = weights
+
+    def summary(self):
+        """
+        Node and leaf counts, depth, and in-memory and serialized size
+        of the fitted model (see base.introspection.model_summary).
+        """
+        return model_summary(self)
+
+    def compact(self):
+        """
+        Compacts every fitted tree in the ensemble.
+        Returns the total number of nodes removed.
+        """
+        removed = sum(est.compact() for est in self.estimators)
+        self._flat_trees = None
+        if self.deduplicate and not self._online:
+            # Compaction can make previously different trees identical
+            self._deduplicate()
+        return removed
+
+    def apply(self, X):
+        """
+        Leaf index of every row in every (distinct) tree,
+        shape (n_samples, len(self.estimators)).
+        """
+        return np.column_stack([est.apply(X) for est in self.estimators])
+
+    def predict_proba(self, X):
+        """
+        Soft vote: the mean of the trees' leaf class distributions,
+        weighted by tree multiplicity. Columns follow self.classes_.
+        """
+        weights = np.asarray(self.estimator_weights, dtype=float)
+        proba = sum(w * est.predict_proba(X) for est, w in zip(self.estimators, weights))
+        return proba / weights.sum()
 
     def _predict_row(self, row):
         """
         Gets a prediction for a single row from all estimators
         and returns the majority vote.
         """
-        # Get predictions from all estimators
-        predictions = [est._predict_row(row, est.tree) for est in self.estimators]
-        
+        if self.voting == "soft":
+            return self.classes_[np.argmax(self.predict_proba(np.asarray(row)[None, :])[0])]
+
+        # Get (weighted) votes from all distinct estimators
+        votes = Counter()
+        for est, weight in zip(self.estimators, self.estimator_weights):
+            votes[est._predict_row(row, est.tree)] += weight
+
         # Return the most common prediction (majority vote)
-        return Counter(predictions).most_common(1)[0][0]
+        return votes.most_common(1)[0][0]
 
     def predict(self, X):
         """
         Predicts the class for each sample in X using majority voting.
         """
+        if self.voting == "soft":
+            return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
         return np.array([self._predict_row(row) for row in X])
+
+    def predict_chunks(self, X, chunk_size=10_000, out=None):
+        """
+        Streams predictions block by block with bounded memory; X may be
+        an array, an np.memmap or an iterable of row blocks. See
+        base.streaming.predict_chunks for the optional 'out' buffer.
+        """
+        return predict_chunks(self.predict, X, chunk_size, out)
+
+    def predict_early_exit(self, X, tree_batch_size=5, time_budget=None):
+        """
+        Majority vote that stops asking trees about a row as soon as its
+        leading class can no longer be caught by the votes still to come.
+
+        Trees are evaluated 'tree_batch_size' at a time on the rows that
+        are still undecided. Without a time budget the result is identical
+        to predict(); rows decided unanimously need only a fraction of the
+        trees. With 'time_budget' (seconds) the vote stops once the budget
+        is spent and undecided rows get their best vote so far.
+
+        The number of trees consulted per row is stored in 'n_trees_used_'.
+        This always uses hard (majority) voting.
+        """
+        X = np.asarray(X)
+        start = time.perf_counter()
+        if self._flat_trees is None:
+            self._flat_trees = [FlatTree.from_tree(est.tree) for est in self.estimators]
+        trees = self._flat_trees
+        weights = np.asarray(self.estimator_weights, dtype=float)
+
+        n = len(X)
+        classes = np.unique(np.concatenate([t.value[t.feature == LEAF] for t in trees]))
+        votes = np.zeros((n, len(classes)))
+        first_seen = np.full((n, len(classes)), len(trees))
+        self.n_trees_used_ = np.zeros(n, dtype=int)
+        active = np.arange(n)
+        remaining = weights.sum()
+
+        for batch_start in range(0, len(trees), tree_batch_size):
+            for i in range(batch_start, min(batch_start + tree_batch_size, len(trees))):
+                cls = np.searchsorted(classes, trees[i].predict(X[active]))
+                votes[active, cls] += weights[i]
+                first_seen[active, cls] = np.minimum(first_seen[active, cls], i)
+                remaining -= weights[i]
+                self.n_trees_used_[active] += 1
+
+            # A row is decided once the runner-up cannot even tie the leader
+            ranked = np.sort(votes[active], axis=1)
+            if len(classes) > 1:
+                undecided = ranked[:, -1] <= ranked[:, -2] + remaining
+            else:
+                undecided = np.zeros(len(active), dtype=bool)
+            active = active[undecided]
+
+            if not active.size:
+                break
+            if time_budget is not None and time.perf_counter() - start > time_budget:
+                break
+
+        # Rows whose top vote counts are equal (an even split, or a vote cut
+        # off by the budget) go to the label seen first, as in predict()
+        leading = votes == votes.max(axis=1, keepdims=True)
+        winner = np.argmin(np.where(leading, first_seen, len(trees) + 1), axis=1)
+        return classes[winner]
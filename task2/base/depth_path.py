@@ -0,0 +1,52 @@
+from copy import deepcopy
+
+import numpy as np
+
+# Depth a "full" tree is grown to, as in PruningWrapper
+FULL_DEPTH = 99
+
+
+def depth_path(estimator, X_train, y_train, X_val, y_val=None, max_depth=None, sample_weight=None):
+    """
+    Predictions (and accuracy) of every max_depth in 1 .. max_depth from
+    a single fit.
+
+    A copy of 'estimator' is fitted once at max_depth (default: grown
+    until every leaf is pure or too small to split) and truncated at each
+    depth by DecisionTreeBase.predict_depths. The result for depth d
+    equals fitting with max_depth=d, so tuning max_depth costs one fit
+    instead of one per candidate.
+
+    Args:
+        estimator: An unfitted DecisionTreeBase with splitter="best" and
+                   max_features=None (random splits draw from the RNG in
+                   node order, so a shallower fit would not be a prefix).
+        y_val (array): Optional validation labels; enables 'accuracy'.
+
+    Returns:
+        dict:
+            depths       np.ndarray of the depths 1 .. depth reached
+            predictions  np.ndarray (len(depths), len(X_val))
+            accuracy     np.ndarray per depth, or None without y_val
+            best_depth   shallowest depth with the highest accuracy (or None)
+            model        the deep fitted estimator
+    """
+    if not hasattr(estimator, "predict_depths"):
+        raise ValueError(f"depth_path needs a DecisionTreeBase, got {type(estimator).__name__}")
+    if estimator.splitter != "best" or estimator.max_features is not None:
+        raise ValueError("depth_path requires splitter='best' and max_features=None, "
+                         "otherwise a shallower fit is not a truncation of the deep tree")
+
+    model = deepcopy(estimator)
+    model.max_depth = FULL_DEPTH if max_depth is None else max_depth
+    model.fit(X_train, y_train, sample_weight=sample_weight)
+
+    predictions = model.predict_depths(X_val)
+    depths = np.arange(1, len(predictions) + 1)
+    accuracy = best_depth = None
+    if y_val is not None:
+        accuracy = np.mean(predictions == np.asarray(y_val)[None, :], axis=1)
+        if len(accuracy):
+            best_depth = int(depths[np.argmax(accuracy)])
+    return {"depths": depths, "predictions": predictions, "accuracy": accuracy,
+            "best_depth": best_depth, "model": model}
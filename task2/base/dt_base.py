@@ -1,30 +1,379 @@
 import numpy as np
 from abc import ABC, abstractmethod
-from collections import Counter
+from copy import deepcopy
+
+from base.flat_tree import LEAF, FlatTree
+from base.instrumentation import BuildRecorder
+from base.out_of_core import build_tree_out_of_core, chunk_source
+from base.streaming import predict_chunks
+
+
+def resolve_max_features(max_features, n_features):
+    """
+    Turns a max_features setting (None, int, float fraction, "sqrt" or
+    "log2") into a number of features between 1 and n_features.
+    """
+    if max_features is None:
+        k = n_features
+    elif max_features == "sqrt":
+        k = int(np.sqrt(n_features))
+    elif max_features == "log2":
+        k = int(np.log2(n_features))
+    elif isinstance(max_features, float):
+        k = int(max_features * n_features)
+    else:
+        k = int(max_features)
+    return min(max(k, 1), n_features)
+
+
+def collapse_duplicates(X, y, sample_weight):
+    """
+    Merges identical (X, y) rows into one row whose weight is the sum of
+    their weights. Rows keep the order of their first occurrence, so ties
+    between classes are broken exactly as on the uncollapsed data.
+    """
+    rows = np.column_stack((X, y))
+    _, first, inverse = np.unique(rows, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    weights = np.bincount(inverse, weights=sample_weight)
+    order = np.argsort(first)
+    return X[first[order]], y[first[order]], weights[order]
+
+
+def count_nodes(tree):
+    """Number of nodes (internal and leaves) in a nested-dict tree."""
+    if not isinstance(tree, dict):
+        return 1
+    subtree = next(iter(tree.values()))
+    return 1 + count_nodes(subtree['left']) + count_nodes(subtree['right'])
+
+
+def tree_depth(tree):
+    """Length of the longest root-to-leaf path (a single leaf has depth 0)."""
+    if not isinstance(tree, dict):
+        return 0
+    subtree = next(iter(tree.values()))
+    return 1 + max(tree_depth(subtree['left']), tree_depth(subtree['right']))
+
+
+def tree_signature(tree):
+    """
+    Hashable nested tuple describing a tree's structure, thresholds and
+    leaf labels. Two trees predict identically if their signatures match.
+    """
+    if not isinstance(tree, dict):
+        return tree
+    (feature, threshold), subtree = next(iter(tree.items()))
+    return (int(feature), float(threshold),
+            tree_signature(subtree['left']), tree_signature(subtree['right']))
+
+
+def _same_subtree(a, b):
+    if isinstance(a, dict) != isinstance(b, dict):
+        return False
+    if not isinstance(a, dict):
+        return a == b
+    (key_a, sub_a), (key_b, sub_b) = next(iter(a.items())), next(iter(b.items()))
+    return (key_a == key_b
+            and _same_subtree(sub_a['left'], sub_b['left'])
+            and _same_subtree(sub_a['right'], sub_b['right']))
+
+
+def node_counts_by_routing(tree, X, y, n_classes, sample_weight=None):
+    """
+    Per-node class counts (pre-order, aligned with flatten_tree) obtained
+    by sending (X, y) down the tree. y holds class indices 0..n_classes-1.
+    """
+    counts = []
+
+    def visit(node, X, y, w):
+        counts.append(np.bincount(y, weights=w, minlength=n_classes))
+        if isinstance(node, dict):
+            (feature, threshold), subtree = next(iter(node.items()))
+            left = X[:, feature] <= threshold
+            visit(subtree['left'], X[left], y[left], w[left])
+            visit(subtree['right'], X[~left], y[~left], w[~left])
+
+    w = np.ones(len(y)) if sample_weight is None else np.asarray(sample_weight, dtype=float)
+    visit(tree, np.asarray(X), np.asarray(y), w)
+    return np.array(counts)
+
+
+def compact_tree(tree, node_counts=None):
+    """
+    Collapses splits that cannot change a prediction, bottom-up: an
+    internal node whose two (already compacted) children are identical,
+    e.g. two leaves with the same label, is replaced by that child.
+
+    If the tree's pre-order node_counts are given, the counts of merged
+    nodes are added up so they still describe the training samples that
+    reach each node.
+
+    Returns:
+        (compacted tree, number of nodes removed, new node_counts or None)
+    """
+    position = [0]
+
+    def visit(node):
+        idx = position[0]
+        position[0] += 1
+        own = [None if node_counts is None else node_counts[idx]]
+        if not isinstance(node, dict):
+            return node, 0, own
+        key, subtree = next(iter(node.items()))
+        left, removed_left, counts_left = visit(subtree['left'])
+        right, removed_right, counts_right = visit(subtree['right'])
+        removed = removed_left + removed_right
+        if _same_subtree(left, right):
+            if node_counts is not None:
+                counts_left = [a + b for a, b in zip(counts_left, counts_right)]
+            return left, removed + 1 + count_nodes(right), counts_left
+        return {key: {'left': left, 'right': right}}, removed, own + counts_left + counts_right
+
+    tree, removed, counts = visit(tree)
+    return tree, removed, None if node_counts is None else np.array(counts)
+
 
 class DecisionTreeBase(ABC):
     """
     Abstract Base for Decision Trees with custom split criteria.
+
+    splitter="best" scans every unique value of every feature at each node.
+    splitter="random" draws `n_random_thresholds` thresholds uniformly within
+    each feature's range in the node instead (Extremely Randomized Trees),
+    so no sorting is needed and a node costs O(n x features).
+
+    max_features limits each node to a random subset of the features
+    (random-forest style per-split subsampling); see resolve_max_features.
+
+    Split search works on (weighted) class-count vectors: each criterion
+    implements criterion_counts(). With collapse_duplicates=True, fit()
+    first merges identical (X, y) rows into weighted unique rows, so the
+    cost of training scales with the number of distinct rows.
+
+    The (weighted) class counts of every node are kept in 'node_counts_',
+    one row per node in pre-order (the node ids used by flatten_tree), so
+    predict_proba() and apply() need a single vectorized traversal.
+    Their majority labels are kept in 'node_values_', from which
+    predict_depths() scores every shallower max_depth without refitting.
+
+    With record_stats=True (or any callbacks), fit() also stores
+    'build_stats_', a per-node table of rows, thresholds and criterion
+    calls evaluated, split-search and partition time and the chosen gain
+    (see base.instrumentation), and reports every node to the callbacks.
     """
 
-    def __init__(self, name, max_depth=5, min_samples_split=2):
+    def __init__(self, name, max_depth=5, min_samples_split=2,
+                 splitter="best", n_random_thresholds=1, max_features=None,
+                 random_state=None, collapse_duplicates=False, record_stats=False,
+                 callbacks=None):
+        if splitter not in ("best", "random"):
+            raise ValueError(f"splitter must be 'best' or 'random', got {splitter!r}")
         self.name = name
         self.max_depth = max_depth
         self.min_samples_split = min_samples_split
+        self.splitter = splitter
+        self.n_random_thresholds = n_random_thresholds
+        self.max_features = max_features
+        self.random_state = random_state
+        self.collapse_duplicates = collapse_duplicates
+        self.record_stats = record_stats
+        self.callbacks = callbacks
         self.tree = None
+        self.node_counts_ = None
+        self.node_values_ = None
+        self.build_stats_ = None
+        self.n_features_in_ = None
+        self._flat = None
+        self._recorder = None
+        self._n_thresholds = 0
+
+    def __deepcopy__(self, memo):
+        # Wrappers clone their base tree with deepcopy; the callbacks
+        # (e.g. one profiler) must stay shared by all the clones
+        if self.callbacks is not None:
+            memo[id(self.callbacks)] = self.callbacks
+        clone = self.__class__.__new__(self.__class__)
+        memo[id(self)] = clone
+        for key, value in self.__dict__.items():
+            setattr(clone, key, deepcopy(value, memo))
+        return clone
 
     @abstractmethod
-    def criterion(self, y_left, y_right, y_parent):
-        """Calculate impurity or gain."""
+    def criterion_counts(self, left_counts, right_counts, parent_counts):
+        """
+        Calculate impurity or gain from per-class (weighted) sample counts.
+        All three arguments are float arrays of length n_classes.
+        """
         pass
 
-    def fit(self, X, y):
-        data = np.concatenate((X, y.reshape(-1, 1)), axis=1)
-        self.tree = self._build_tree(data, depth=0)
+    def criterion_range(self, n_classes, n_samples):
+        """
+        Largest possible spread of criterion_counts values for a split of
+        n_samples samples over n_classes classes (the R of the Hoeffding
+        bound used by HoeffdingTree). Criteria override this when their
+        scale is not [0, 1].
+        """
+        return 1.0
+
+    def criterion(self, y_left, y_right, y_parent):
+        """Calculate impurity or gain from raw label arrays."""
+        classes = np.unique(y_parent)
+        def counts(y):
+            return np.bincount(np.searchsorted(classes, y), minlength=len(classes)).astype(float)
+        return self.criterion_counts(counts(y_left), counts(y_right), counts(y_parent))
+
+    def fit(self, X, y, sample_weight=None):
+        self._rng = np.random.RandomState(self.random_state)
+        X = np.asarray(X)
+        self.classes_, y = np.unique(np.asarray(y), return_inverse=True)
+        y = y.reshape(-1)
+        self.n_features_in_ = X.shape[1]
+        if sample_weight is None:
+            w = np.ones(len(y))
+        else:
+            # Zero-weight rows cannot influence any split, drop them up front
+            w = np.asarray(sample_weight, dtype=float)
+            keep = w > 0
+            X, y, w = X[keep], y[keep], w[keep]
+        if self.collapse_duplicates:
+            X, y, w = collapse_duplicates(X, y, w)
+        recorder = None
+        if self.record_stats or self.callbacks:
+            recorder = self._recorder = BuildRecorder(self, self.callbacks or ())
+            # An instance attribute shadows the method, so every call is counted
+            self.criterion_counts = recorder.counting(self.criterion_counts)
+        # _build_tree visits nodes in pre-order and logs each node's counts and majority label
+        self._counts_log = []
+        self._values_log = []
+        try:
+            if recorder is not None:
+                recorder.fit_start(X, y)
+            self.tree = self._build_tree(X, y, w, depth=0)
+        finally:
+            # Even when a callback or the build raises, leave no stale
+            # recorder for the next fit's _build_tree to pick up
+            if recorder is not None:
+                del self.criterion_counts
+            self._recorder = None
+        self.node_counts_ = np.array(self._counts_log)
+        self.node_values_ = np.array(self._values_log)
+        del self._counts_log, self._values_log
+        self._flat = None
+        if recorder is not None:
+            self.build_stats_ = recorder.table()
+            recorder.fit_end(self.build_stats_)
+
+    def fit_out_of_core(self, X, y=None, chunk_size=100_000, max_bins=256):
+        """
+        Fits without loading the data into memory. X and y may be
+        np.memmap arrays (read chunk_size rows at a time), or X may be a
+        zero-argument callable returning a fresh iterator of
+        (X_block, y_block) pairs for every pass.
+
+        The tree is grown level by level with one sequential scan per
+        level (see base.out_of_core). Features with more than max_bins
+        distinct values only consider max_bins quantile thresholds;
+        otherwise the result matches fit(). The number of scans made is
+        stored in 'n_passes_'.
+        """
+        self._rng = np.random.RandomState(self.random_state)
+        source = chunk_source(X, y, chunk_size)
+        self.n_features_in_ = None if callable(X) else X.shape[1]
+        self.tree, self.node_counts_, self.classes_, self.n_passes_ = \
+            build_tree_out_of_core(self, source, max_bins)
+        self.node_values_ = None
+        self._flat = None
+
+    def summary(self):
+        """
+        Node and leaf counts, depth, and in-memory and serialized size
+        of the fitted model (see base.introspection.model_summary).
+        """
+        # Imported here: base.introspection itself imports this module
+        from base.introspection import model_summary
+        return model_summary(self)
+
+    def compact(self):
+        """
+        Merges redundant sibling leaves and no-op splits after fitting.
+        Predictions are unchanged; merged leaves pool their class counts.
+        Returns the number of nodes removed.
+        """
+        self.tree, removed, self.node_counts_ = compact_tree(self.tree, self.node_counts_)
+        # Merged subtrees no longer match a depth-truncated fit
+        self.node_values_ = None
+        self._flat = None
+        return removed
+
+    def _flat_tree(self):
+        if self._flat is None:
+            self._flat = FlatTree.from_tree(self.tree)
+        return self._flat
+
+    def apply(self, X):
+        """Pre-order index of the leaf each row of X falls into."""
+        return self._flat_tree().apply(X)
+
+    def predict_proba(self, X):
+        """
+        Class probabilities from the training class counts of each row's
+        leaf. Columns follow self.classes_.
+        """
+        counts = self.node_counts_[self.apply(X)]
+        return counts / counts.sum(axis=1, keepdims=True)
 
     def predict(self, X):
         return np.array([self._predict_row(row, self.tree) for row in X])
 
+    def predict_depths(self, X, depths=None):
+        """
+        Predictions of this tree truncated at every depth in 'depths'
+        (default 1 .. depth of the tree), from one level-by-level pass.
+
+        Growth is greedy, so with splitter="best" and no max_features the
+        tree fit() builds with max_depth=d is this tree cut at depth d,
+        its new leaves labelled with the majority class of their node
+        ('node_values_', pre-order like node_counts_). One deep fit
+        therefore scores every max_depth; see base.depth_path.
+
+        Returns:
+            np.ndarray: shape (len(depths), len(X)), row i for depths[i].
+        """
+        if self.node_values_ is None:
+            raise ValueError("predict_depths needs the node labels recorded by fit() "
+                             "(not available after compact() or fit_out_of_core())")
+        flat = self._flat_tree()
+        X = np.asarray(X)
+        if depths is None:
+            depths = range(1, tree_depth(self.tree) + 1)
+        depths = list(depths)
+        out = np.empty((len(depths), len(X)), dtype=self.node_values_.dtype)
+        wanted = {}
+        for i, d in enumerate(depths):
+            wanted.setdefault(d, []).append(i)
+
+        node = np.full(len(X), flat.root, dtype=np.int64)
+        active = np.flatnonzero(flat.feature[node] != LEAF)
+        for level in range(max(depths, default=-1) + 1):
+            # Every row is now at its depth-'level' node or at a shallower leaf
+            for i in wanted.get(level, ()):
+                out[i] = self.node_values_[node]
+            if active.size:
+                current = node[active]
+                go_left = X[active, flat.feature[current]] <= flat.threshold[current]
+                node[active] = np.where(go_left, flat.left[current], flat.right[current])
+                active = active[flat.feature[node[active]] != LEAF]
+        return out
+
+    def predict_chunks(self, X, chunk_size=10_000, out=None):
+        """
+        Streams predictions block by block with bounded memory; X may be
+        an array, an np.memmap or an iterable of row blocks. See
+        base.streaming.predict_chunks for the optional 'out' buffer.
+        """
+        return predict_chunks(self.predict, X, chunk_size, out)
+
     def _predict_row(self, row, tree):
         if isinstance(tree, dict):
             feature, threshold = list(tree.keys())[0]
@@ -35,40 +384,132 @@ class DecisionTreeBase(ABC):
         else:
             return tree  # leaf node
 
-    def _build_tree(self, data, depth):
-        X, y = data[:, :-1], data[:, -1]
-        n_samples, n_features = X.shape
+    def _class_counts(self, y, w):
+        return np.bincount(y, weights=w, minlength=len(self.classes_))
+
+    def _leaf_value(self, y, w, counts=None):
+        """
+        Weighted majority class. Ties go to the class seen first,
+        matching Counter(y).most_common(1) on unweighted data.
+        """
+        if counts is None:
+            counts = self._class_counts(y, w)
+        best = np.flatnonzero(counts == counts.max())
+        if len(best) > 1:
+            first_seen = [np.argmax(y == c) for c in best]
+            best = best[np.argmin(first_seen)]
+        else:
+            best = best[0]
+        return self.classes_[best]
+
+    def _candidate_features(self, n_features):
+        """Feature indices to search at one node."""
+        if self.max_features is None:
+            return range(n_features)
+        k = resolve_max_features(self.max_features, n_features)
+        return np.sort(self._rng.choice(n_features, size=k, replace=False))
+
+    def _best_threshold(self, values, y, w, parent_counts):
+        """
+        Exhaustive search over every unique value of one feature.
+        A single (value x class) histogram and its running sums give the
+        class counts on both sides of every threshold.
+        """
+        n_classes = len(parent_counts)
+        uniques, inverse = np.unique(values, return_inverse=True)
+        hist = np.bincount(inverse.reshape(-1) * n_classes + y, weights=w,
+                           minlength=len(uniques) * n_classes).reshape(-1, n_classes)
+        left_cum = np.cumsum(hist, axis=0)
+        right_cum = np.cumsum(hist[::-1], axis=0)[::-1]
+
+        self._n_thresholds += len(uniques) - 1
+        best_gain, best_val = -np.inf, None
+        for i in range(len(uniques) - 1):
+            gain = self.criterion_counts(left_cum[i], right_cum[i + 1], parent_counts)
+            if gain > best_gain:
+                best_gain, best_val = gain, uniques[i]
+        return best_gain, best_val
+
+    def _best_random_threshold(self, values, y, w, parent_counts):
+        """
+        Extra-Trees search: only n_random_thresholds thresholds drawn
+        uniformly in [min, max) of the feature are evaluated.
+        """
+        lo, hi = values.min(), values.max()
+        if lo == hi:
+            return -np.inf, None
+
+        self._n_thresholds += self.n_random_thresholds
+        best_gain, best_val = -np.inf, None
+        # uniform() draws from [lo, hi), so both sides are never empty
+        for val in self._rng.uniform(lo, hi, size=self.n_random_thresholds):
+            mask = values <= val
+            left = self._class_counts(y[mask], w[mask])
+            right = self._class_counts(y[~mask], w[~mask])
+            gain = self.criterion_counts(left, right, parent_counts)
+            if gain > best_gain:
+                best_gain, best_val = gain, val
+        return best_gain, best_val
+
+    def _build_tree(self, X, y, w, depth):
+        n_features = X.shape[1]
+        n_samples = w.sum()
+        parent_counts = self._class_counts(y, w)
+        # The label this node would have as a leaf (see predict_depths)
+        value = self._leaf_value(y, w, parent_counts)
+        self._counts_log.append(parent_counts)
+        self._values_log.append(value)
+        recorder = self._recorder
+        if recorder is not None:
+            stats = recorder.open_node(depth, len(y), n_samples)
 
         # Stopping condition
-        if len(set(y)) == 1 or depth >= self.max_depth or n_samples < self.min_samples_split:
-            return Counter(y).most_common(1)[0][0]
+        if np.count_nonzero(parent_counts) == 1 or depth >= self.max_depth or n_samples < self.min_samples_split:
+            if recorder is not None:
+                recorder.close_node(stats)
+            return value
+
+        if self.splitter == "random":
+            search = self._best_random_threshold
+        else:
+            search = self._best_threshold
 
         best_gain = -np.inf
         best_split = None
 
-        # Try all possible splits
-        for feature_idx in range(n_features):
-            values = np.unique(X[:, feature_idx])
-            for val in values:
-                left = data[X[:, feature_idx] <= val]
-                right = data[X[:, feature_idx] > val]
-                if len(left) == 0 or len(right) == 0:
-                    continue
-
-                gain = self.criterion(left[:, -1], right[:, -1], y)
-                if gain > best_gain:
-                    best_gain = gain
-                    best_split = (feature_idx, val, left, right)
+        # Try all candidate splits
+        candidates = self._candidate_features(n_features)
+        for feature_idx in candidates:
+            gain, val = search(X[:, feature_idx], y, w, parent_counts)
+            if val is not None and gain > best_gain:
+                best_gain = gain
+                best_split = (feature_idx, val)
+        if recorder is not None:
+            recorder.searched(stats, len(candidates))
 
         # No valid split found
         if best_split is None:
-            return Counter(y).most_common(1)[0][0]
+            if recorder is not None:
+                recorder.close_node(stats)
+            return value
+
+        feature, threshold = best_split
+        left = X[:, feature] <= threshold
+        right = ~left
 
-        feature, threshold, left, right = best_split
+        if recorder is None:
+            node = {(feature, threshold): {
+                'left': self._build_tree(X[left], y[left], w[left], depth + 1),
+                'right': self._build_tree(X[right], y[right], w[right], depth + 1)
+            }}
+            return node
 
+        # Instrumented fits partition both sides up front so the cost can be timed
+        parts = [(X[mask], y[mask], w[mask]) for mask in (left, right)]
+        recorder.close_node(stats, best_gain, feature, threshold, partitioned=True)
         node = {(feature, threshold): {
-            'left': self._build_tree(left, depth + 1),
-            'right': self._build_tree(right, depth + 1)
+            'left': self._build_tree(*parts[0], depth + 1),
+            'right': self._build_tree(*parts[1], depth + 1)
         }}
         return node
 
@@ -0,0 +1,171 @@
+import numpy as np
+
+from base.dt_base import tree_depth
+from base.flat_tree import LEAF, flatten_tree, model_trees
+
+# Python's parser refuses deeply indented code, so deeper trees
+# are always exported as embedded arrays
+_MAX_CODE_DEPTH = 50
+
+_HEADER = '''"""
+Standalone scorer for {name}.
+
+Generated by base/export.py. Needs only the Python standard library:
+predict_row(row) returns the class of one row (a sequence of feature
+values), predict(rows) a list of classes for an iterable of rows.
+"""
+'''
+
+_VOTE = '''
+
+def predict_row(row):
+    # Weighted majority vote; max() keeps the first label seen on ties
+    votes = {}
+    for tree, weight in zip(TREES, WEIGHTS):
+        label = tree(row)
+        votes[label] = votes.get(label, 0) + weight
+    return max(votes, key=votes.get)
+
+
+def predict(rows):
+    return [predict_row(row) for row in rows]
+'''
+
+_SOFT_VOTE = '''
+
+def predict_row(row):
+    # Soft vote: weighted mean of the trees' leaf class distributions
+    # (each tree returns one); the first class wins ties
+    totals = [0.0] * len(CLASSES)
+    for tree, weight in zip(TREES, WEIGHTS):
+        for k, p in enumerate(tree(row)):
+            totals[k] += weight * p
+    totals = [t / sum(WEIGHTS) for t in totals]
+    return CLASSES[totals.index(max(totals))]
+
+
+def predict(rows):
+    return [predict_row(row) for row in rows]
+'''
+
+_WALK = '''
+
+def _walk(node, row):
+    while FEATURE[node] != {leaf}:
+        if row[FEATURE[node]] <= THRESHOLD[node]:
+            node = LEFT[node]
+        else:
+            node = RIGHT[node]
+    return VALUE[node]
+'''
+
+
+def _literal(value):
+    """Plain Python literal for a (possibly NumPy) scalar."""
+    return repr(value.item() if hasattr(value, "item") else value)
+
+
+def _distribution(row):
+    return "(" + "".join(f"{float(p)!r}, " for p in row) + ")"
+
+
+def _tree_code(tree, fn_name, proba=None):
+    """
+    Straight-line if/else function for one tree. Leaves return their
+    label, or with 'proba' (the tree's pre-order node distributions)
+    their class distribution.
+    """
+    lines = [f"def {fn_name}(row):"]
+    position = [0]
+
+    def emit(node, indent):
+        pad = "    " * indent
+        idx = position[0]
+        position[0] += 1
+        if not isinstance(node, dict):
+            value = _literal(node) if proba is None else _distribution(proba[idx])
+            lines.append(f"{pad}return {value}")
+            return
+        (feature, threshold), subtree = next(iter(node.items()))
+        lines.append(f"{pad}if row[{int(feature)}] <= {float(threshold)!r}:")
+        emit(subtree['left'], indent + 1)
+        lines.append(f"{pad}else:")
+        emit(subtree['right'], indent + 1)
+
+    emit(tree, 1)
+    return "\n".join(lines)
+
+
+def _arrays_code(trees, proba=None):
+    parts, roots, offset = [], [], 0
+    for tree in trees:
+        flat = flatten_tree(tree, offset=offset)
+        roots.append(offset)
+        offset += len(flat['feature'])
+        parts.append(flat)
+
+    def joined(key, fmt):
+        return "[" + ", ".join(fmt(v) for part in parts for v in part[key]) + "]"
+
+    lines = [
+        f"FEATURE = {joined('feature', lambda v: str(int(v)))}",
+        f"THRESHOLD = {joined('threshold', lambda v: repr(float(v)))}",
+        f"LEFT = {joined('left', lambda v: str(int(v)))}",
+        f"RIGHT = {joined('right', lambda v: str(int(v)))}",
+        f"VALUE = {joined('value', _literal)}" if proba is None else
+        f"VALUE = [{', '.join(_distribution(row) for row in proba)}]",
+        _WALK.format(leaf=LEAF),
+    ]
+    for i, root in enumerate(roots):
+        lines.append(f"\ndef _tree_{i}(row):\n    return _walk({root}, row)\n")
+    return "\n".join(lines)
+
+
+def export_scorer(model, path=None, style="auto"):
+    """
+    Generates a self-contained Python module that reproduces the
+    predictions of a fitted tree, pruned tree or bagged ensemble
+    (soft-voting ensembles embed the class distribution of every leaf).
+
+    Args:
+        model: A fitted DecisionTreeBase, PruningWrapper or BaggingWrapper.
+        path (str): Where to write the module; None only returns the source.
+        style (str): "code" emits straight-line if/else functions,
+                     "arrays" emits node arrays and a small traversal loop,
+                     "auto" uses "code" unless a tree is too deep for it.
+
+    Returns:
+        str: The module source.
+    """
+    if style not in ("auto", "code", "arrays"):
+        raise ValueError(f"style must be 'auto', 'code' or 'arrays', got {style!r}")
+    trees, weights, kind = model_trees(model)
+    soft = kind == "ensemble" and getattr(model, "voting", "hard") == "soft"
+    probas = [None] * len(trees)
+    if soft:
+        # Same per-node distributions BaggingWrapper.predict_proba averages
+        probas = [est.node_counts_ / est.node_counts_.sum(axis=1, keepdims=True) for est in model.estimators]
+
+    if style == "auto":
+        deep = any(tree_depth(tree) > _MAX_CODE_DEPTH for tree in trees)
+        style = "arrays" if deep else "code"
+
+    if style == "code":
+        body = "\n\n\n".join(_tree_code(tree, f"_tree_{i}", probas[i]) for i, tree in enumerate(trees))
+    else:
+        body = _arrays_code(trees, np.concatenate(probas) if soft else None)
+
+    source = "\n".join([
+        _HEADER.format(name=model.name),
+        body,
+        "",
+        f"TREES = ({', '.join(f'_tree_{i}' for i in range(len(trees)))},)",
+        f"WEIGHTS = ({', '.join(str(int(w)) for w in weights)},)",
+        f"CLASSES = ({''.join(_literal(c) + ', ' for c in model.classes_)})" if soft else "",
+        "",
+    ]) + (_SOFT_VOTE if soft else _VOTE)
+
+    if path is not None:
+        with open(path, "w") as f:
+            f.write(source)
+    return source
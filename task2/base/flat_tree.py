@@ -0,0 +1,162 @@
+import numpy as np
+
+# Marker stored in 'feature' for leaf nodes
+LEAF = -1
+
+
+def flatten_tree(tree, offset=0):
+    """
+    Converts a nested-dict tree into flat pre-order node arrays.
+
+    Node i is a leaf if feature[i] == LEAF, in which case value[i] is its
+    label; otherwise rows with X[:, feature[i]] <= threshold[i] go to node
+    left[i] and the others to node right[i]. Child indices are absolute,
+    i.e. shifted by 'offset', so several trees can share one set of arrays.
+
+    Returns:
+        dict of arrays: feature, threshold, left, right, value
+    """
+    feature, threshold, left, right, value = [], [], [], [], []
+
+    def visit(node):
+        idx = len(feature)
+        feature.append(LEAF)
+        threshold.append(0.0)
+        left.append(LEAF)
+        right.append(LEAF)
+        if not isinstance(node, dict):
+            value.append(node)
+            return idx
+        value.append(0)
+        (f, t), subtree = next(iter(node.items()))
+        feature[idx] = int(f)
+        threshold[idx] = float(t)
+        left[idx] = visit(subtree['left']) + offset
+        right[idx] = visit(subtree['right']) + offset
+        return idx
+
+    visit(tree)
+    values = np.asarray(value)
+    if values.dtype.kind not in "biuf":
+        raise ValueError(f"Only numeric class labels can be flattened, got dtype {values.dtype}")
+    return {
+        'feature': np.asarray(feature, dtype=np.int32),
+        'threshold': np.asarray(threshold, dtype=np.float64),
+        'left': np.asarray(left, dtype=np.int32),
+        'right': np.asarray(right, dtype=np.int32),
+        'value': values,
+    }
+
+
+def model_trees(model):
+    """
+    Returns (trees, weights, kind) for a fitted DecisionTreeBase or
+    PruningWrapper (kind "tree") or BaggingWrapper (kind "ensemble").
+    """
+    if hasattr(model, "estimators"):
+        if not model.estimators:
+            raise ValueError("Estimator not fitted. Call fit() first.")
+        weights = getattr(model, "estimator_weights", None) or [1] * len(model.estimators)
+        return [est.tree for est in model.estimators], weights, "ensemble"
+    if getattr(model, "tree", None) is None:
+        raise ValueError("Estimator not fitted. Call fit() first.")
+    return [model.tree], [1], "tree"
+
+
+class FlatTree:
+    """
+    A fitted tree stored as flat node arrays (see flatten_tree).
+    Prediction routes all rows level by level with vectorized gathers
+    instead of recursing once per row. The arrays may be np.memmap views.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, root=0, name="Flat tree"):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.root = root
+        self.name = name
+
+    @classmethod
+    def from_tree(cls, tree, name="Flat tree"):
+        return cls(name=name, **flatten_tree(tree))
+
+    def apply(self, X):
+        """Index of the leaf node each row of X ends up in."""
+        X = np.asarray(X)
+        node = np.full(len(X), self.root, dtype=np.int64)
+        active = np.flatnonzero(self.feature[node] != LEAF)
+        while active.size:
+            current = node[active]
+            go_left = X[active, self.feature[current]] <= self.threshold[current]
+            node[active] = np.where(go_left, self.left[current], self.right[current])
+            active = active[self.feature[node[active]] != LEAF]
+        return node
+
+    def predict(self, X):
+        return self.value[self.apply(X)]
+
+    def _predict_row(self, row, tree=None):
+        node = self.root
+        while self.feature[node] != LEAF:
+            if row[self.feature[node]] <= self.threshold[node]:
+                node = self.left[node]
+            else:
+                node = self.right[node]
+        return self.value[node]
+
+
+class FlatEnsemble:
+    """
+    A bagged ensemble of FlatTree objects sharing one set of node arrays,
+    with per-tree vote weights (see BaggingWrapper.estimator_weights).
+
+    With voting="soft", 'proba' holds the class distribution of every
+    node (columns follow 'classes') and predictions follow the weighted
+    mean distribution, as in BaggingWrapper(voting="soft").
+    """
+
+    def __init__(self, trees, weights, name="Flat ensemble", voting="hard", proba=None, classes=None):
+        if voting == "soft" and (proba is None or classes is None):
+            raise ValueError("Soft voting needs the per-node 'proba' and 'classes'")
+        self.trees = trees
+        self.weights = np.asarray(weights)
+        self.name = name
+        self.voting = voting
+        self.proba = proba
+        self.classes = classes
+
+    def predict_proba(self, X):
+        """Weighted mean of the trees' leaf distributions (soft voting only)."""
+        if self.proba is None:
+            raise ValueError("This ensemble was saved without class distributions (hard voting)")
+        X = np.asarray(X)
+        weights = self.weights.astype(float)
+        proba = sum(w * self.proba[tree.apply(X)] for tree, w in zip(self.trees, weights))
+        return proba / weights.sum()
+
+    def predict(self, X):
+        """
+        Weighted majority vote. Ties go to the label first predicted by
+        the earliest tree, matching BaggingWrapper.predict. Soft-voting
+        ensembles predict the most probable class instead.
+        """
+        if self.voting == "soft":
+            return self.classes[np.argmax(self.predict_proba(X), axis=1)]
+        X = np.asarray(X)
+        n = len(X)
+        rows = np.arange(n)
+        # Trees usually share their arrays, so collect leaf labels once per array
+        arrays = {id(t.value): t for t in self.trees}.values()
+        classes = np.unique(np.concatenate([t.value[t.feature == LEAF] for t in arrays]))
+        votes = np.zeros((n, len(classes)))
+        first_seen = np.full((n, len(classes)), len(self.trees))
+        for i, (tree, weight) in enumerate(zip(self.trees, self.weights)):
+            cls = np.searchsorted(classes, tree.predict(X))
+            votes[rows, cls] += weight
+            first_seen[rows, cls] = np.minimum(first_seen[rows, cls], i)
+        leading = votes == votes.max(axis=1, keepdims=True)
+        winner = np.argmin(np.where(leading, first_seen, len(self.trees) + 1), axis=1)
+        return classes[winner]
@@ -0,0 +1,301 @@
+import numpy as np
+
+from base.flat_tree import LEAF, FlatTree
+
+
+class _LeafStats:
+    """
+    Sufficient statistics of one leaf: class counts for prediction and,
+    per feature, the class counts of every feature value seen since the
+    leaf was created.
+    """
+
+    def __init__(self, n_features, n_classes, prior=None):
+        self.counts = np.zeros(n_classes) if prior is None else prior.copy()
+        self.seen = np.zeros(n_classes)
+        self.tables = [dict() for _ in range(n_features)]
+        self.n_since_check = 0.0
+
+    def add_class(self, position):
+        self.counts = np.insert(self.counts, position, 0.0)
+        self.seen = np.insert(self.seen, position, 0.0)
+        for table in self.tables:
+            for value in table:
+                table[value] = np.insert(table[value], position, 0.0)
+
+    def update(self, X, y, w, n_classes):
+        batch_counts = np.bincount(y, weights=w, minlength=n_classes)
+        self.counts += batch_counts
+        self.seen += batch_counts
+        self.n_since_check += w.sum()
+        for f, table in enumerate(self.tables):
+            values, inverse = np.unique(X[:, f], return_inverse=True)
+            hist = np.bincount(inverse.reshape(-1) * n_classes + y, weights=w,
+                               minlength=len(values) * n_classes).reshape(-1, n_classes)
+            for value, value_counts in zip(values.tolist(), hist):
+                if value in table:
+                    table[value] += value_counts
+                else:
+                    table[value] = value_counts
+
+
+class HoeffdingTree:
+    """
+    An incremental decision tree (VFDT / Hoeffding tree) that uses the
+    split criterion of any DecisionTreeBase subclass.
+
+    Each leaf keeps class counts per feature value. Every 'grace_period'
+    (weighted) examples a leaf scores all binary splits "feature <= value"
+    with base_estimator.criterion_counts and splits once the best one beats
+    the best split on any other feature by more than the Hoeffding bound
+
+        eps = R * sqrt(ln(1 / delta) / (2 * n)),
+
+    where R is base_estimator.criterion_range, or when eps drops below
+    'tie_threshold' (in the units of the criterion). Updating costs
+    O(features) per example and never revisits old data. The fitted model
+    is exposed as the same nested-dict 'tree' used by DecisionTreeBase, so
+    it plugs into BaggingWrapper and the export and save_model helpers.
+    Depth is limited by base_estimator.max_depth.
+    """
+
+    def __init__(self, base_estimator, delta=1e-7, grace_period=200, tie_threshold=0.05):
+        """
+        Initializes the Hoeffding tree.
+
+        Args:
+            base_estimator: A DecisionTreeBase instance providing the
+                            split criterion and max_depth.
+            delta (float): Allowed probability of choosing the wrong split.
+            grace_period (int): Examples a leaf collects between split attempts.
+            tie_threshold (float): Split anyway once eps falls below this.
+        """
+        self.base_estimator = base_estimator
+        self.delta = delta
+        self.grace_period = grace_period
+        self.tie_threshold = tie_threshold
+        self.classes_ = None
+        self._reset()
+
+        self.name = f"Hoeffding ({self.base_estimator.name})"
+
+    def _reset(self):
+        self.classes_ = None
+        self.n_features_ = None
+        self._feature = [LEAF]
+        self._threshold = [0.0]
+        self._left = [LEAF]
+        self._right = [LEAF]
+        self._depth = [0]
+        self._leaves = {}
+        self._tree = None
+        self._node_counts = None
+        self._flat = None
+
+    # ------------------------------
+    # Learning
+    # ------------------------------
+    def fit(self, X, y, sample_weight=None):
+        """Starts from an empty tree and learns (X, y) as one stream."""
+        self._reset()
+        self.partial_fit(X, y, sample_weight)
+
+    def partial_fit(self, X, y, sample_weight=None, classes=None):
+        """
+        Updates the tree with a batch of examples.
+
+        Args:
+            X, y: The new examples.
+            sample_weight: Optional per-example weights (e.g. the Poisson
+                           counts of online bagging).
+            classes: All class labels, if known up front. Labels not seen
+                     before are otherwise added as they appear.
+        """
+        X = np.asarray(X)
+        y = np.asarray(y)
+        w = np.ones(len(y)) if sample_weight is None else np.asarray(sample_weight, dtype=float)
+        keep = w > 0
+        X, y, w = X[keep], y[keep], w[keep]
+
+        if self.n_features_ is None:
+            self.n_features_ = X.shape[1]
+            self.classes_ = np.array([], dtype=y.dtype)
+            self._leaves[0] = _LeafStats(self.n_features_, 0)
+        self._add_classes(np.unique(y) if classes is None else np.asarray(classes))
+        if not len(y):
+            return
+
+        codes = np.searchsorted(self.classes_, y)
+        # Route in blocks of grace_period rows so a split made early in a
+        # large batch already receives the rest of it
+        for start in range(0, len(y), self.grace_period):
+            block = slice(start, start + self.grace_period)
+            X_block, codes_block, w_block = X[block], codes[block], w[block]
+            leaf_ids = self._route(X_block)
+            for leaf_id in np.unique(leaf_ids):
+                rows = leaf_ids == leaf_id
+                leaf = self._leaves[leaf_id]
+                leaf.update(X_block[rows], codes_block[rows], w_block[rows], len(self.classes_))
+                if leaf.n_since_check >= self.grace_period:
+                    leaf.n_since_check = 0.0
+                    self._attempt_split(leaf_id)
+
+        self._tree = self._node_counts = self._flat = None
+
+    def _add_classes(self, labels):
+        for label in labels:
+            position = np.searchsorted(self.classes_, label)
+            if position < len(self.classes_) and self.classes_[position] == label:
+                continue
+            self.classes_ = np.insert(self.classes_, position, label)
+            for leaf in self._leaves.values():
+                leaf.add_class(position)
+
+    def _route(self, X):
+        feature = np.asarray(self._feature)
+        threshold = np.asarray(self._threshold)
+        left = np.asarray(self._left)
+        right = np.asarray(self._right)
+        node = np.zeros(len(X), dtype=np.int64)
+        active = np.flatnonzero(feature[node] != LEAF)
+        while active.size:
+            current = node[active]
+            go_left = X[active, feature[current]] <= threshold[current]
+            node[active] = np.where(go_left, left[current], right[current])
+            active = active[feature[node[active]] != LEAF]
+        return node
+
+    def _attempt_split(self, leaf_id):
+        leaf = self._leaves[leaf_id]
+        if self._depth[leaf_id] >= self.base_estimator.max_depth:
+            return
+        if np.count_nonzero(leaf.seen) <= 1:
+            return
+
+        # Best threshold of every feature, scored on the leaf's statistics
+        per_feature = []
+        for f, table in enumerate(leaf.tables):
+            if len(table) < 2:
+                continue
+            values = sorted(table)
+            left_cum = np.cumsum([table[v] for v in values], axis=0)
+            best = (-np.inf, None, None)
+            for i in range(len(values) - 1):
+                gain = self.base_estimator.criterion_counts(left_cum[i], leaf.seen - left_cum[i], leaf.seen)
+                if gain > best[0]:
+                    best = (gain, values[i], left_cum[i])
+            per_feature.append((best[0], f, best[1], best[2]))
+        if not per_feature:
+            return
+
+        per_feature.sort(key=lambda item: item[0], reverse=True)
+        best_gain, feature, threshold, left_counts = per_feature[0]
+        runner_up = per_feature[1][0] if len(per_feature) > 1 else 0.0
+
+        n = leaf.seen.sum()
+        R = self.base_estimator.criterion_range(len(self.classes_), n)
+        eps = R * np.sqrt(np.log(1 / self.delta) / (2 * n))
+        if not (best_gain - runner_up > eps or eps < self.tie_threshold):
+            return
+
+        # Turn the leaf into a split. Each class's counts (which include any
+        # prior inherited from the parent) are shared out in proportion to
+        # where that class's seen examples went, so both children stay
+        # non-negative and add up to the leaf
+        left_share = np.divide(left_counts, leaf.seen, out=np.zeros_like(leaf.seen), where=leaf.seen > 0)
+        left_counts = left_share * leaf.counts
+        children = []
+        for prior in (left_counts, leaf.counts - left_counts):
+            child_id = len(self._feature)
+            self._feature.append(LEAF)
+            self._threshold.append(0.0)
+            self._left.append(LEAF)
+            self._right.append(LEAF)
+            self._depth.append(self._depth[leaf_id] + 1)
+            self._leaves[child_id] = _LeafStats(self.n_features_, len(self.classes_), prior)
+            children.append(child_id)
+        self._feature[leaf_id] = feature
+        self._threshold[leaf_id] = threshold
+        self._left[leaf_id], self._right[leaf_id] = children
+        del self._leaves[leaf_id]
+
+    # ------------------------------
+    # Nested-dict view and prediction
+    # ------------------------------
+    def _rebuild(self):
+        counts = []
+
+        def visit(node_id):
+            position = len(counts)
+            counts.append(None)
+            if self._feature[node_id] == LEAF:
+                counts[position] = self._leaves[node_id].counts
+                return self.classes_[np.argmax(counts[position])] if len(self.classes_) else None, counts[position]
+            left, left_counts = visit(self._left[node_id])
+            right, right_counts = visit(self._right[node_id])
+            counts[position] = left_counts + right_counts
+            node = {(self._feature[node_id], self._threshold[node_id]): {
+                'left': left,
+                'right': right
+            }}
+            return node, counts[position]
+
+        self._tree, _ = visit(0)
+        self._node_counts = np.array(counts)
+
+    @property
+    def tree(self):
+        """The current model as a DecisionTreeBase-style nested dict."""
+        if self.n_features_ is None:
+            return None
+        if self._tree is None:
+            self._rebuild()
+        return self._tree
+
+    @property
+    def n_features_in_(self):
+        return self.n_features_
+
+    @property
+    def node_counts_(self):
+        """Class counts of every node in pre-order (see DecisionTreeBase)."""
+        if self.n_features_ is None:
+            return None
+        if self._node_counts is None:
+            self._rebuild()
+        return self._node_counts
+
+    @node_counts_.setter
+    def node_counts_(self, counts):
+        # BaggingWrapper re-expresses counts over the ensemble's classes
+        self._node_counts = counts
+
+    def compact(self):
+        """
+        No-op: merging leaves would discard the statistics they still
+        need to keep growing. Compact a frozen copy of 'tree' instead.
+        """
+        return 0
+
+    def _flat_tree(self):
+        if self._flat is None:
+            self._flat = FlatTree.from_tree(self.tree)
+        return self._flat
+
+    def apply(self, X):
+        """Pre-order index of the leaf each row of X falls into."""
+        return self._flat_tree().apply(X)
+
+    def predict(self, X):
+        if self.tree is None:
+            raise ValueError("Estimator not fitted. Call fit() or partial_fit() first.")
+        return np.array([self._predict_row(row, self.tree) for row in X])
+
+    def predict_proba(self, X):
+        """Class probabilities from the counts of each row's leaf."""
+        counts = self.node_counts_[self.apply(X)]
+        return counts / counts.sum(axis=1, keepdims=True)
+
+    def _predict_row(self, row, tree):
+        """Pass-through used by BaggingWrapper, as in PruningWrapper."""
+        return self.base_estimator._predict_row(row, tree)
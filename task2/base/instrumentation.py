@@ -0,0 +1,94 @@
+import time
+
+import numpy as np
+
+# One row per node, in pre-order (the node ids of node_counts_ and flatten_tree)
+STATS_DTYPE = np.dtype([
+    ("node", np.int32),
+    ("depth", np.int32),
+    ("n_rows", np.int64),            # training rows reaching the node
+    ("n_samples", np.float64),       # their total weight
+    ("n_features", np.int32),        # features searched
+    ("n_thresholds", np.int64),      # candidate thresholds evaluated
+    ("n_criterion_calls", np.int64),
+    ("search_seconds", np.float64),  # split search
+    ("partition_seconds", np.float64),
+    ("gain", np.float64),            # NaN for leaves
+    ("feature", np.int32),           # -1 for leaves
+    ("threshold", np.float64),
+])
+
+
+class BuildRecorder:
+    """
+    Collects per-node statistics while DecisionTreeBase._build_tree runs
+    and forwards them to profiler callbacks.
+
+    A callback is any object with some of these methods:
+
+        on_fit_start(estimator, X, y)
+        on_node(estimator, row)     # row: dict with the STATS_DTYPE fields
+        on_fit_end(estimator, table)
+
+    on_node is called once a node's split has been chosen and its rows
+    partitioned, before its children are built, so a profiler can
+    attribute time to nodes, depths or features as the tree grows.
+    """
+
+    def __init__(self, estimator, callbacks=()):
+        self.estimator = estimator
+        self.callbacks = list(callbacks)
+        self.rows = []
+        self.n_criterion_calls = 0
+
+    def _dispatch(self, hook, *args):
+        for callback in self.callbacks:
+            method = getattr(callback, hook, None)
+            if method is not None:
+                method(self.estimator, *args)
+
+    def counting(self, criterion_counts):
+        """Wraps a bound criterion_counts so every call is counted."""
+        def counted(left_counts, right_counts, parent_counts):
+            self.n_criterion_calls += 1
+            return criterion_counts(left_counts, right_counts, parent_counts)
+        return counted
+
+    def fit_start(self, X, y):
+        self._dispatch("on_fit_start", X, y)
+
+    def open_node(self, depth, n_rows, n_samples):
+        row = {"node": len(self.rows), "depth": depth, "n_rows": n_rows, "n_samples": n_samples,
+               "n_features": 0, "n_thresholds": 0, "n_criterion_calls": 0,
+               "search_seconds": 0.0, "partition_seconds": 0.0,
+               "gain": np.nan, "feature": -1, "threshold": np.nan}
+        self.rows.append(row)
+        self._calls_at_open = self.n_criterion_calls
+        self._thresholds_at_open = self.estimator._n_thresholds
+        self._clock = time.perf_counter()
+        return row
+
+    def searched(self, row, n_features):
+        """Marks the end of the split search of the node opened last."""
+        now = time.perf_counter()
+        row["search_seconds"] = now - self._clock
+        row["n_features"] = n_features
+        row["n_thresholds"] = self.estimator._n_thresholds - self._thresholds_at_open
+        row["n_criterion_calls"] = self.n_criterion_calls - self._calls_at_open
+        self._clock = now
+
+    def close_node(self, row, gain=np.nan, feature=-1, threshold=np.nan, partitioned=False):
+        if partitioned:
+            row["partition_seconds"] = time.perf_counter() - self._clock
+        row["gain"], row["feature"], row["threshold"] = gain, feature, threshold
+        self._dispatch("on_node", row)
+
+    def table(self):
+        """The collected rows as a NumPy structured array (STATS_DTYPE)."""
+        table = np.zeros(len(self.rows), dtype=STATS_DTYPE)
+        for name in STATS_DTYPE.names:
+            table[name] = [row[name] for row in self.rows]
+        return table
+
+    def fit_end(self, table):
+        self._dispatch("on_fit_end", table)
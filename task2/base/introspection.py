@@ -0,0 +1,64 @@
+import sys
+import types
+
+import numpy as np
+
+from base.dt_base import count_nodes, tree_depth
+from base.flat_tree import model_trees
+from base.model_io import serialized_size
+
+
+def count_leaves(tree):
+    """Number of leaves in a nested-dict tree."""
+    if not isinstance(tree, dict):
+        return 1
+    subtree = next(iter(tree.values()))
+    return count_leaves(subtree['left']) + count_leaves(subtree['right'])
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Bytes of memory held by an object and everything it references
+    (dicts, sequences, NumPy arrays and attributes of plain objects),
+    counting shared objects once. Modules, classes and functions are
+    not counted.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, (types.ModuleType, type, types.FunctionType, types.MethodType)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, np.ndarray):
+        # getsizeof counts the buffer only for arrays that own it
+        if obj.base is not None and not isinstance(obj, np.memmap):
+            size += deep_sizeof(obj.base, seen)
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def model_summary(model):
+    """
+    Size and shape of a fitted DecisionTreeBase, PruningWrapper or
+    BaggingWrapper:
+
+        n_trees           distinct trees stored (after deduplication)
+        n_nodes, n_leaves summed over those trees
+        depth             deepest root-to-leaf path
+        memory_bytes      memory held by the Python object (deep_sizeof)
+        serialized_bytes  size of the file save_model would write
+    """
+    trees, _, _ = model_trees(model)
+    return {
+        "n_trees": len(trees),
+        "n_nodes": sum(count_nodes(tree) for tree in trees),
+        "n_leaves": sum(count_leaves(tree) for tree in trees),
+        "depth": max(tree_depth(tree) for tree in trees),
+        "memory_bytes": deep_sizeof(model),
+        "serialized_bytes": serialized_size(model),
+    }
@@ -0,0 +1,97 @@
+import numpy as np
+
+
+class LookupTableWrapper:
+    """
+    A wrapper class that compiles a fitted tree or ensemble over a small
+    categorical input space into a dense lookup table.
+
+    When every feature is a label-encoded code 0..k-1 (as produced by
+    load_and_preprocess), the whole input space is the product of the
+    cardinalities. If that product is at most 'max_cells', every cell is
+    predicted once and stored; a row's prediction then is a single gather
+    at its mixed-radix index. Larger domains, and rows with codes outside
+    the compiled domain, fall back to the wrapped model's own predict.
+    """
+
+    def __init__(self, base_estimator, max_cells=100_000):
+        """
+        Initializes the Lookup-table wrapper.
+
+        Args:
+            base_estimator: A DecisionTreeBase, PruningWrapper or
+                            BaggingWrapper instance.
+            max_cells (int): Largest input space that is compiled.
+        """
+        self.base_estimator = base_estimator
+        self.max_cells = max_cells
+        self.radices_ = None
+        self.strides_ = None
+        self.table_ = None
+
+        self.name = f"Lookup ({self.base_estimator.name})"
+
+    def fit(self, X, y):
+        """
+        Fits the wrapped estimator, then compiles it over the
+        domain observed in X.
+        """
+        self.base_estimator.fit(X, y)
+        self.compile(X)
+
+    def compile(self, X=None, cardinalities=None):
+        """
+        Builds the lookup table for an already fitted estimator.
+
+        Args:
+            X: Data whose per-column maximum code defines the domain.
+            cardinalities: Explicit number of codes per feature
+                           (takes precedence over X).
+
+        Returns:
+            bool: True if a table was built, False if the model will
+                  fall back to normal traversal.
+        """
+        self.radices_ = self.strides_ = self.table_ = None
+
+        if cardinalities is None:
+            X = np.asarray(X)
+            # Only non-negative integer codes can be mixed-radix encoded
+            if X.size == 0 or X.min() < 0 or not np.all(np.mod(X, 1) == 0):
+                return False
+            cardinalities = X.max(axis=0).astype(np.int64) + 1
+        radices = np.asarray(cardinalities, dtype=np.int64)
+
+        # Python ints here so a huge domain cannot overflow the check
+        n_cells = int(np.prod([int(r) for r in radices]))
+        if n_cells > self.max_cells:
+            return False
+
+        # Row-major strides: the last feature varies fastest
+        strides = np.ones(len(radices), dtype=np.int64)
+        strides[:-1] = np.cumprod(radices[::-1])[::-1][1:]
+
+        cells = np.indices(radices).reshape(len(radices), -1).T
+        self.table_ = np.asarray(self.base_estimator.predict(cells))
+        self.radices_ = radices
+        self.strides_ = strides
+        return True
+
+    def predict(self, X):
+        """
+        Predicts by table lookup, using the wrapped estimator
+        for rows outside the compiled domain.
+        """
+        if self.table_ is None:
+            return self.base_estimator.predict(X)
+
+        X = np.asarray(X)
+        inside = np.all((X >= 0) & (X < self.radices_) & (np.mod(X, 1) == 0), axis=1)
+        if inside.all():
+            return self.table_[X.astype(np.int64) @ self.strides_]
+
+        preds = np.empty(len(X), dtype=self.table_.dtype)
+        preds[inside] = self.table_[X[inside].astype(np.int64) @ self.strides_]
+        if (~inside).any():
+            preds[~inside] = self.base_estimator.predict(X[~inside])
+        return preds
@@ -0,0 +1,145 @@
+import json
+import struct
+
+import numpy as np
+
+from base.flat_tree import FlatEnsemble, FlatTree, flatten_tree, model_trees
+
+# File layout (all integers little-endian):
+#   8 bytes   magic
+#   4 bytes   format version (uint32)
+#   4 bytes   header length in bytes (uint32)
+#   header    UTF-8 JSON: model kind, name, number of input features
+#             (null if unknown), per-tree roots and weights, voting mode,
+#             and dtype/offset/shape of every node array
+#   arrays    raw node arrays; the section starts at the first 64-byte
+#             boundary after the header, each array on a 64-byte boundary
+#             within it (offsets in the header are relative to the section),
+#             so np.memmap views are aligned
+#
+# Version 2 adds soft-voting ensembles, which also store 'proba' (the
+# normalised class counts of every node) and 'classes'. Hard-voting
+# models are still written as version 1, readable by older code.
+MAGIC = b"DTFLAT\x00\x00"
+FORMAT_VERSION = 2
+_ALIGN = 64
+_ARRAYS = ("feature", "threshold", "left", "right", "value")
+
+
+def _aligned(n):
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _encode(model):
+    """Node arrays, their layout and the header bytes of a model file."""
+    trees, weights, kind = model_trees(model)
+
+    parts, roots, offset = [], [], 0
+    for tree in trees:
+        flat = flatten_tree(tree, offset=offset)
+        roots.append(offset)
+        offset += len(flat['feature'])
+        parts.append(flat)
+    arrays = {key: np.concatenate([p[key] for p in parts]) for key in _ARRAYS}
+
+    voting = getattr(model, "voting", "hard") if kind == "ensemble" else "hard"
+    if voting == "soft":
+        # Same per-node distributions BaggingWrapper.predict_proba averages
+        if any(getattr(est, "node_counts_", None) is None for est in model.estimators):
+            raise ValueError("Soft-voting models need the node_counts_ of every tree")
+        arrays["proba"] = np.concatenate([est.node_counts_ / est.node_counts_.sum(axis=1, keepdims=True)
+                                          for est in model.estimators])
+        arrays["classes"] = np.asarray(model.classes_)
+
+    layout, start = {}, 0
+    for key in arrays:
+        arr = arrays[key]
+        layout[key] = {"dtype": arr.dtype.str, "offset": start, "shape": list(arr.shape)}
+        start = _aligned(start + arr.nbytes)
+    header = {
+        "kind": kind,
+        "name": model.name,
+        "n_features": getattr(model, "n_features_in_", None),
+        "roots": roots,
+        "weights": [int(w) for w in weights],
+        "n_nodes": offset,
+        "voting": voting,
+        "arrays": layout,
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    return arrays, layout, header_bytes
+
+
+def serialized_size(model):
+    """Size in bytes of the file save_model(model, path) would write."""
+    arrays, layout, header_bytes = _encode(model)
+    last = list(arrays)[-1]
+    return _aligned(len(MAGIC) + 8 + len(header_bytes)) + layout[last]["offset"] + arrays[last].nbytes
+
+
+def save_model(model, path):
+    """
+    Writes a fitted DecisionTreeBase, PruningWrapper or BaggingWrapper
+    to 'path' in the flat binary format. All trees of an ensemble are
+    concatenated into one set of node arrays.
+    """
+    arrays, layout, header_bytes = _encode(model)
+    data_start = _aligned(len(MAGIC) + 8 + len(header_bytes))
+    version = 2 if "proba" in arrays else 1
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<II", version, len(header_bytes)))
+        f.write(header_bytes)
+        for key in arrays:
+            f.seek(data_start + layout[key]["offset"])
+            f.write(np.ascontiguousarray(arrays[key]).tobytes())
+
+
+def load_model(path, mmap=True):
+    """
+    Loads a model written by save_model.
+
+    With mmap=True the node arrays are read-only np.memmap views of the
+    file: loading is near-instant and processes scoring with the same
+    file share a single page-cache copy.
+
+    Returns:
+        FlatTree for a single (possibly pruned) tree, FlatEnsemble for a
+        bagged model. Both provide predict(X), and 'n_features_in_' is
+        the training width (None for files that do not record it).
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a flat tree model file")
+        version, header_len = struct.unpack("<II", f.read(8))
+        if version > FORMAT_VERSION:
+            raise ValueError(f"{path} uses format version {version}, "
+                             f"this code reads up to {FORMAT_VERSION}")
+        header = json.loads(f.read(header_len).decode("utf-8"))
+    data_start = _aligned(len(MAGIC) + 8 + header_len)
+
+    # One read-only mapping of the whole file; every node array is a view into it
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+
+    arrays = {}
+    for key, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        start = data_start + spec["offset"]
+        count = int(np.prod(spec["shape"]))
+        arrays[key] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+    proba = arrays.pop("proba", None)
+    classes = arrays.pop("classes", None)
+
+    trees = [FlatTree(root=root, name=header["name"], **arrays) for root in header["roots"]]
+    if header["kind"] == "tree":
+        model = trees[0]
+    else:
+        model = FlatEnsemble(trees, header["weights"], name=header["name"],
+                             voting=header.get("voting", "hard"), proba=proba, classes=classes)
+    model.n_features_in_ = header.get("n_features")
+    return model
@@ -0,0 +1,250 @@
+import numpy as np
+
+from base.flat_tree import LEAF
+
+
+def chunk_source(X, y=None, chunk_size=100_000):
+    """
+    Normalizes the training input of an out-of-core fit into a function
+    that starts a fresh pass over the data.
+
+    X may be an array or np.memmap together with y (sliced lazily, so
+    only one chunk is in memory at a time), or a zero-argument callable
+    returning a new iterator of (X_block, y_block) pairs on every call.
+    """
+    if callable(X):
+        return X
+
+    def passes():
+        for start in range(0, X.shape[0], chunk_size):
+            yield np.asarray(X[start:start + chunk_size]), np.asarray(y[start:start + chunk_size])
+    return passes
+
+
+# Distinct values a feature's summary may hold, per max_bins, before it
+# is compressed during the discovery pass
+_SKETCH_FACTOR = 8
+
+
+def _compress(values, weights, size):
+    """
+    Reduces a sorted summary to about 'size' points evenly spaced in
+    (weighted) rank, keeping the minimum and maximum. Each kept point
+    takes over the weight of the points merged into it.
+    """
+    cum = np.cumsum(weights)
+    idx = np.searchsorted(cum, np.linspace(cum[0], cum[-1], size), side="left")
+    idx = np.unique(np.concatenate([[0, len(values) - 1], idx]))
+    return values[idx], np.diff(cum[idx], prepend=0.0)
+
+
+def _discover(source, max_bins):
+    """
+    First pass: class labels and per-feature split candidates.
+    Features with more than max_bins distinct values are reduced to
+    max_bins quantile candidates.
+
+    Each feature keeps a summary of its distinct values, each weighted
+    by the number of distinct values it stands for. It is exact until it
+    exceeds _SKETCH_FACTOR * max_bins points and is then compressed to
+    points evenly spaced in rank, so memory stays bounded however many
+    distinct values a continuous column has.
+    """
+    classes = None
+    summaries = None
+    size = _SKETCH_FACTOR * max_bins
+    for X_block, y_block in source():
+        block_classes = np.unique(y_block)
+        classes = block_classes if classes is None else np.union1d(classes, block_classes)
+        if summaries is None:
+            summaries = [(np.empty(0, dtype=X_block.dtype), np.empty(0))] * X_block.shape[1]
+        for f, (values, weights) in enumerate(summaries):
+            new = np.unique(X_block[:, f])
+            merged, inverse = np.unique(np.concatenate([values, new]), return_inverse=True)
+            # A value already in the summary is not counted again
+            merged_weights = np.zeros(len(merged))
+            np.maximum.at(merged_weights, inverse.reshape(-1), np.concatenate([weights, np.ones(len(new))]))
+            if len(merged) > size:
+                merged, merged_weights = _compress(merged, merged_weights, size)
+            summaries[f] = (merged, merged_weights)
+    if classes is None:
+        raise ValueError("Cannot fit on an empty data source")
+
+    candidates = []
+    for values, weights in summaries:
+        if len(values) > max_bins and np.all(weights == 1):
+            values = np.unique(np.quantile(values, np.linspace(0, 1, max_bins)))
+        elif len(values) > max_bins:
+            # Compressed summary: np.quantile's interpolation over weighted ranks
+            cum = np.cumsum(weights)
+            position = (cum - cum[0]) / (cum[-1] - cum[0])
+            values = np.unique(np.interp(np.linspace(0, 1, max_bins), position, values))
+        candidates.append(values)
+    return classes, candidates
+
+
+class _Node:
+    __slots__ = ("depth", "counts", "first_seen", "feature", "threshold", "left", "right", "value")
+
+    def __init__(self, depth):
+        self.depth = depth
+        self.counts = None
+        self.first_seen = None
+        self.feature = LEAF
+        self.threshold = 0.0
+        self.left = LEAF
+        self.right = LEAF
+        self.value = None
+
+
+def build_tree_out_of_core(estimator, source, max_bins=256):
+    """
+    Grows a tree breadth-first with one sequential pass over the data
+    per level. During a pass every row is routed through the partially
+    built tree and added to a (node, candidate bin, class) histogram of
+    the node it reaches; the split of each open node is then chosen from
+    those histograms with estimator.criterion_counts, exactly like the
+    in-memory exhaustive search. Memory is bounded by the histograms of
+    one level and the candidate summaries of the first pass (see
+    _discover), not by the number of rows.
+
+    Returns:
+        (nested-dict tree, pre-order node_counts, classes, number of passes)
+    """
+    classes, candidates = _discover(source, max_bins)
+    n_classes = len(classes)
+    n_features = len(candidates)
+    n_bins = [len(c) + 1 for c in candidates]
+    passes = 1
+
+    nodes = [_Node(depth=0)]
+    open_nodes = [0]
+    while open_nodes:
+        slot_of = {node_id: slot for slot, node_id in enumerate(open_nodes)}
+        n_open = len(open_nodes)
+        feature = np.array([n.feature for n in nodes])
+        threshold = np.array([n.threshold for n in nodes])
+        left = np.array([n.left for n in nodes])
+        right = np.array([n.right for n in nodes])
+        slot_lookup = np.full(len(nodes), -1)
+        slot_lookup[open_nodes] = np.arange(n_open)
+
+        # One pass: histogram every open node
+        hists = [np.zeros(n_open * nb * n_classes) for nb in n_bins]
+        counts = np.zeros((n_open, n_classes))
+        first_seen = np.full((n_open, n_classes), np.iinfo(np.int64).max)
+        offset = 0
+        for X_block, y_block in source():
+            y_codes = np.searchsorted(classes, y_block)
+            node = np.zeros(len(X_block), dtype=np.int64)
+            active = np.flatnonzero(feature[node] != LEAF)
+            while active.size:
+                current = node[active]
+                go_left = X_block[active, feature[current]] <= threshold[current]
+                node[active] = np.where(go_left, left[current], right[current])
+                active = active[feature[node[active]] != LEAF]
+
+            slots = slot_lookup[node]
+            mine = np.flatnonzero(slots >= 0)
+            slots, rows_y = slots[mine], y_codes[mine]
+            np.add.at(counts, (slots, rows_y), 1)
+            np.minimum.at(first_seen, (slots, rows_y), mine + offset)
+            for f in range(n_features):
+                bins = np.searchsorted(candidates[f], X_block[mine, f], side="left")
+                key = (slots * n_bins[f] + bins) * n_classes + rows_y
+                hists[f] += np.bincount(key, minlength=len(hists[f]))
+            offset += len(X_block)
+        passes += 1
+
+        next_open = []
+        for node_id in open_nodes:
+            slot = slot_of[node_id]
+            node = nodes[node_id]
+            node.counts = counts[slot]
+            node.first_seen = first_seen[slot]
+            if _is_leaf(estimator, node.counts, node.depth):
+                node.value = _majority(node.counts, node.first_seen)
+                continue
+            split = _choose_split(estimator, node, slot, hists, candidates, n_bins, n_classes)
+            if split is None:
+                node.value = _majority(node.counts, node.first_seen)
+                continue
+            node.feature, node.threshold, left_counts = split
+            node.left, node.right = len(nodes), len(nodes) + 1
+            for child_counts in (left_counts, node.counts - left_counts):
+                child = _Node(node.depth + 1)
+                # A child that must be a leaf with an unambiguous majority
+                # is finished now; the others need the next pass
+                if (_is_leaf(estimator, child_counts, child.depth)
+                        and np.count_nonzero(child_counts == child_counts.max()) == 1):
+                    child.counts = child_counts
+                    child.value = int(np.argmax(child_counts))
+                else:
+                    next_open.append(len(nodes))
+                nodes.append(child)
+        open_nodes = next_open
+
+    tree_counts = []
+
+    def to_dict(node_id):
+        node = nodes[node_id]
+        tree_counts.append(node.counts)
+        if node.feature == LEAF:
+            return classes[node.value]
+        return {(node.feature, node.threshold): {
+            'left': to_dict(node.left),
+            'right': to_dict(node.right)
+        }}
+
+    tree = to_dict(0)
+    return tree, np.array(tree_counts), classes, passes
+
+
+def _majority(counts, first_seen):
+    """Most frequent class; ties go to the class seen first in the data."""
+    best = np.flatnonzero(counts == counts.max())
+    return best[np.argmin(first_seen[best])]
+
+
+def _is_leaf(estimator, counts, depth):
+    """The stopping conditions of DecisionTreeBase._build_tree."""
+    return (np.count_nonzero(counts) <= 1 or depth >= estimator.max_depth
+            or counts.sum() < estimator.min_samples_split)
+
+
+def _choose_split(estimator, node, slot, hists, candidates, n_bins, n_classes):
+    """
+    Best split of one open node as (feature, threshold, left class counts),
+    or None if no threshold separates its rows.
+    """
+    parent_counts = node.counts
+    best_gain, best_split = -np.inf, None
+    for f in estimator._candidate_features(len(candidates)):
+        hist = hists[f].reshape(-1, n_bins[f], n_classes)[slot]
+        left_cum = np.cumsum(hist, axis=0)
+        totals = left_cum.sum(axis=1)
+        n = parent_counts.sum()
+
+        if estimator.splitter == "random":
+            present = np.flatnonzero(hist.sum(axis=1) > 0)
+            present = present[present < len(candidates[f])]
+            if len(present) < 2:
+                continue
+            lo, hi = candidates[f][present[0]], candidates[f][present[-1]]
+            options = []
+            for val in estimator._rng.uniform(lo, hi, size=estimator.n_random_thresholds):
+                # The histogram only resolves candidates: the split is taken
+                # at the largest one <= val, so routing matches the counts
+                i = np.searchsorted(candidates[f], val, side="right") - 1
+                options.append((i, candidates[f][i]))
+        else:
+            options = [(i, candidates[f][i]) for i in range(len(candidates[f]))]
+
+        for i, val in options:
+            # Candidates absent from this node give empty sides; skip them
+            if totals[i] <= 0 or totals[i] >= n:
+                continue
+            gain = estimator.criterion_counts(left_cum[i], parent_counts - left_cum[i], parent_counts)
+            if gain > best_gain:
+                best_gain, best_split = gain, (f, val, left_cum[i])
+    return best_split
@@ -3,6 +3,11 @@ from collections import Counter
 from copy import deepcopy
 from sklearn.model_selection import train_test_split
 
+from base.dt_base import compact_tree, node_counts_by_routing
+from base.flat_tree import FlatTree
+from base.introspection import model_summary
+from base.streaming import predict_chunks
+
 class PruningWrapper:
     """
     A wrapper class to implement Reduced Error Pruning (REP)
@@ -36,6 +41,12 @@ class PruningWrapper:
         # --- FIX 1 ---
         # Add 'self.tree' for compatibility with BaggingWrapper
         self.tree = None 
+
+        # Class counts of every node of the pruned tree (pre-order)
+        self.node_counts_ = None
+        self.classes_ = None
+        self.n_features_in_ = None
+        self._flat = None
         
         self.name = f"Pruned ({self.base_estimator.name})"
 
@@ -44,6 +55,7 @@ class PruningWrapper:
         Fits the base estimator on a subset of the data and then
         prunes it using a validation set.
         """
+        self.n_features_in_ = np.shape(X)[1]
         # 1. Split the *training* data into a sub-train and validation set
         X_train_sub, X_val, y_train_sub, y_val = train_test_split(
             X, y, 
@@ -60,6 +72,9 @@ class PruningWrapper:
             
             # --- FIX 2 ---
             self.tree = self.tree_ # Assign to 'self.tree'
+            self.classes_ = self.estimator_.classes_
+            self.node_counts_ = self.estimator_.node_counts_
+            self._flat = None
             return
 
         # 2. Grow a full (deep) tree on the sub-train set
@@ -81,6 +96,14 @@ class PruningWrapper:
         # --- FIX 3 ---
         self.tree = self.tree_ # Assign the final pruned tree to 'self.tree'
 
+        # 4. Recount the training samples reaching each node of the pruned tree
+        self.classes_ = self.estimator_.classes_
+        self.node_counts_ = node_counts_by_routing(
+            self.tree_, X_train_sub, np.searchsorted(self.classes_, y_train_sub),
+            len(self.classes_)
+        )
+        self._flat = None
+
     def _prune_recursive(self, node, X_val, y_val, X_train, y_train):
         """
         Recursively prunes a tree.
@@ -145,6 +168,41 @@ class PruningWrapper:
         else:
             return node  # Keep the subtree
 
+    def summary(self):
+        """
+        Node and leaf counts, depth, and in-memory and serialized size
+        of the fitted model (see base.introspection.model_summary).
+        """
+        return model_summary(self)
+
+    def compact(self):
+        """
+        Merges redundant sibling leaves and no-op splits left in the
+        pruned tree. Returns the number of nodes removed.
+        """
+        if self.tree_ is None:
+            raise ValueError("Estimator not fitted. Call fit() first.")
+        self.tree_, removed, self.node_counts_ = compact_tree(self.tree_, self.node_counts_)
+        self.tree = self.tree_
+        self._flat = None
+        return removed
+
+    def apply(self, X):
+        """Pre-order index of the leaf of the pruned tree each row falls into."""
+        if self.tree_ is None:
+            raise ValueError("Estimator not fitted. Call fit() first.")
+        if self._flat is None:
+            self._flat = FlatTree.from_tree(self.tree_)
+        return self._flat.apply(X)
+
+    def predict_proba(self, X):
+        """
+        Class probabilities from the training class counts of each row's
+        leaf in the pruned tree. Columns follow self.classes_.
+        """
+        counts = self.node_counts_[self.apply(X)]
+        return counts / counts.sum(axis=1, keepdims=True)
+
     def _calculate_accuracy(self, X, y, tree):
         """Helper to get accuracy of a given tree on (X, y)"""
         if len(y) == 0:
@@ -168,6 +226,14 @@ class PruningWrapper:
             [self.estimator_._predict_row(row, self.tree_) for row in X]
         )
 
+    def predict_chunks(self, X, chunk_size=10_000, out=None):
+        """
+        Streams predictions block by block with bounded memory; X may be
+        an array, an np.memmap or an iterable of row blocks. See
+        base.streaming.predict_chunks for the optional 'out' buffer.
+        """
+        return predict_chunks(self.predict, X, chunk_size, out)
+
     def _predict_row(self, row, tree):
         """
          Pass-through method called by the BaggingWrapper.
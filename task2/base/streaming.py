@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def iter_row_blocks(X, chunk_size):
+    """
+    Yields consecutive blocks of at most 'chunk_size' rows.
+
+    X may be an array or np.memmap (sliced lazily, so only one block is
+    ever materialized) or any iterable of 2-D row blocks, e.g. a reader
+    over a file larger than memory. Oversized blocks are split.
+    """
+    if hasattr(X, "shape"):
+        for start in range(0, X.shape[0], chunk_size):
+            yield np.asarray(X[start:start + chunk_size])
+        return
+    for block in X:
+        block = np.asarray(block)
+        for start in range(0, len(block), chunk_size):
+            yield block[start:start + chunk_size]
+
+
+def predict_chunks(predict, X, chunk_size=10_000, out=None):
+    """
+    Applies 'predict' block by block with bounded memory.
+
+    Args:
+        predict: The model's batch predict function.
+        X: Array, np.memmap or iterable of row blocks (see iter_row_blocks).
+        chunk_size (int): Rows per block.
+        out: Optional 1-D output buffer (e.g. a writable np.memmap).
+             Predictions are written into it in order and the yielded
+             values are views of it.
+
+    Yields:
+        The predictions of each block.
+    """
+    written = 0
+    for block in iter_row_blocks(X, chunk_size):
+        preds = predict(block)
+        if out is None:
+            yield preds
+            continue
+        end = written + len(preds)
+        if end > len(out):
+            raise ValueError(f"Output buffer holds {len(out)} rows but the input has more")
+        out[written:end] = preds
+        yield out[written:end]
+        written = end
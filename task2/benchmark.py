@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from constants import datasets
+from dataset_store import load_dataset
+from experiment_grid import CRITERIA, MODEL_TYPES, SPLIT_SEED, make_model
+from fit_cache import code_version
+from synthetic import make_classification_data
+
+# Metrics compared against a baseline: name -> True if higher is worse
+METRICS = {
+    "fit_seconds": True,
+    "predict_seconds": True,
+    "fit_peak_mb": True,
+    "predict_rows_per_sec": False,
+}
+
+
+# ------------------------------
+# Workloads
+# ------------------------------
+def synthetic_case(n_rows, n_features=10, n_classes=3, cardinality=8, seed=0):
+    """Categorical data of a given size (see synthetic.make_classification_data)."""
+    X, y = make_classification_data(n_rows, n_features, cardinality, n_classes, seed=seed)
+    return f"synthetic-{n_rows}", X, y
+
+
+def registered_cases(missing="drop", log=print):
+    """The constants.datasets entries that can be loaded (cache or network)."""
+    for d in datasets:
+        try:
+            X, y = load_dataset(d, missing=missing)
+        except Exception as e:
+            log(f"Skipping {d['name']} due to error: {e}")
+            continue
+        yield d["name"], X, y
+
+
+# ------------------------------
+# Measurement
+# ------------------------------
+def _best_time(fn, repeat):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(model_factory, X_train, y_train, X_test, repeat=3):
+    """
+    Best-of-'repeat' wall time of fit and predict, and the peak memory
+    traced during one extra fit (tracemalloc slows code down, so it is
+    kept out of the timed runs). Returns a dict of METRICS.
+    """
+    model = model_factory()
+    fit_seconds = _best_time(lambda: model.fit(X_train, y_train), repeat)
+    predict_seconds = _best_time(lambda: model.predict(X_test), repeat)
+
+    tracemalloc.start()
+    model_factory().fit(X_train, y_train)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+        "fit_peak_mb": peak / 2 ** 20,
+        "predict_rows_per_sec": len(X_test) / max(predict_seconds, 1e-12),
+    }
+
+
+def run(cases, criteria=None, model_types=None, n_estimators=10, repeat=3, log=print):
+    """
+    Benchmarks every criterion x model type on every (name, X, y) case.
+    Returns the JSON-ready report.
+    """
+    results = []
+    for name, X, y in cases:
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=SPLIT_SEED)
+        for criterion in criteria or CRITERIA:
+            for model_type in model_types or MODEL_TYPES:
+                def factory():
+                    return make_model(criterion, model_type, n_estimators)
+                metrics = measure(factory, X_train, y_train, X_test, repeat)
+                results.append({"case": name, "criterion": criterion, "model_type": model_type,
+                                "n_train": len(y_train), "n_test": len(y_test), **metrics})
+                log(f"{name:30s} | {criterion:10s} | {model_type:6s} | "
+                    f"fit {metrics['fit_seconds'] * 1000:9.1f} ms | "
+                    f"predict {metrics['predict_rows_per_sec']:11.0f} rows/s | "
+                    f"peak {metrics['fit_peak_mb']:7.1f} MB")
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "code_version": code_version(),
+            "n_estimators": n_estimators,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+# ------------------------------
+# Regression check
+# ------------------------------
+def compare(baseline, current, tolerance=0.2):
+    """
+    Lists the metrics of 'current' that are more than 'tolerance'
+    (relative) worse than the same (case, criterion, model type) in
+    'baseline'. Entries present in only one report are ignored.
+    """
+    def key(r):
+        return r["case"], r["criterion"], r["model_type"]
+
+    reference = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        old = reference.get(key(r))
+        if old is None:
+            continue
+        for metric, higher_is_worse in METRICS.items():
+            before, after = old[metric], r[metric]
+            if before <= 0:
+                continue
+            change = (after - before) / before
+            if (change if higher_is_worse else -change) > tolerance:
+                regressions.append({"case": r["case"], "criterion": r["criterion"],
+                                    "model_type": r["model_type"], "metric": metric,
+                                    "baseline": before, "current": after, "change": change})
+    return regressions
+
+
+def _report_regressions(regressions, tolerance):
+    if not regressions:
+        print(f"No regressions beyond {tolerance:.0%}.")
+        return 0
+    print(f"{len(regressions)} regression(s) beyond {tolerance:.0%}:")
+    for r in regressions:
+        print(f"  {r['case']:30s} | {r['criterion']:10s} | {r['model_type']:6s} | {r['metric']:20s} "
+              f"{r['baseline']:.4g} -> {r['current']:.4g} ({r['change']:+.0%})")
+    return 1
+
+# ------------------------------
+# MAIN
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark fit/predict time and memory of every criterion and wrapper.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="run the benchmark and write a JSON report")
+    p_run.add_argument("--out", default="results/benchmark.json")
+    p_run.add_argument("--no-datasets", action="store_true", help="skip the registered datasets")
+    p_run.add_argument("--sizes", type=int, nargs="*", default=[1_000, 10_000, 50_000],
+                       help="synthetic dataset sizes (rows)")
+    p_run.add_argument("--criteria", nargs="*", default=None, choices=list(CRITERIA))
+    p_run.add_argument("--model-types", nargs="*", default=None, choices=list(MODEL_TYPES))
+    p_run.add_argument("--n-estimators", type=int, default=10)
+    p_run.add_argument("--repeat", type=int, default=3)
+    p_run.add_argument("--baseline", default=None, help="compare against this report when done")
+    p_run.add_argument("--tolerance", type=float, default=0.2)
+
+    p_cmp = sub.add_parser("compare", help="flag regressions of a report against a baseline")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--tolerance", type=float, default=0.2)
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        sys.exit(_report_regressions(compare(baseline, current, args.tolerance), args.tolerance))
+
+    cases = [] if args.no_datasets else list(registered_cases())
+    cases += [synthetic_case(n) for n in args.sizes]
+    report = run(cases, args.criteria, args.model_types, args.n_estimators, args.repeat)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nBenchmark report saved to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        sys.exit(_report_regressions(compare(baseline, report, args.tolerance), args.tolerance))
@@ -1,3 +1,5 @@
+# Columns are categorical unless listed under "numeric"; categorical
+# columns are label-encoded, numeric ones are kept as numbers
 datasets = [
     {
         "name": "Car Evaluation",
@@ -38,17 +40,20 @@ datasets = [
         "cols": [
             "A1", "A2", "A3", "A4", "A5", "A6", "A7", "A8", "A9",
             "A10", "A11", "A12", "A13", "A14", "A15", "class"
-        ]
+        ],
+        "numeric": ["A2", "A3", "A8", "A11", "A14", "A15"]
     },
     {
         "name": "Balance Scale",
         "url": "https://archive.ics.uci.edu/ml/machine-learning-databases/balance-scale/balance-scale.data",
-        "cols": ["class", "left-weight", "left-distance", "right-weight", "right-distance"]
+        "cols": ["class", "left-weight", "left-distance", "right-weight", "right-distance"],
+        "numeric": ["left-weight", "left-distance", "right-weight", "right-distance"]
     },
     {
         "name": "Hayes-Roth",
         "url": "https://archive.ics.uci.edu/ml/machine-learning-databases/hayes-roth/hayes-roth.data",
-        "cols": ["id", "hobby", "age", "education", "marital-status", "class"]
+        "cols": ["id", "hobby", "age", "education", "marital-status", "class"],
+        "numeric": ["id"]
     },
     {
         "name": "Congressional Voting Records",
@@ -7,22 +7,26 @@ class DT_ChiSquare(DecisionTreeBase):
     Chi² = Σ (Observed - Expected)² / Expected
     """
 
-    def __init__(self):
-        super().__init__("Chi-Square")
+    def __init__(self, **kwargs):
+        super().__init__("Chi-Square", **kwargs)
 
-    def chi_square(self, y_left, y_right):
-        total = len(y_left) + len(y_right)
-        n_classes = max(int(y_left.max()), int(y_right.max())) + 1
-        obs_left = np.bincount(y_left.astype(int), minlength=n_classes)
-        obs_right = np.bincount(y_right.astype(int), minlength=n_classes)
+    def chi_square(self, left_counts, right_counts):
+        n_left, n_right = left_counts.sum(), right_counts.sum()
+        total = n_left + n_right
+        obs_left = left_counts
+        obs_right = right_counts
         total_obs = obs_left + obs_right
 
-        expected_left = total_obs * (len(y_left) / total)
-        expected_right = total_obs * (len(y_right) / total)
+        expected_left = total_obs * (n_left / total)
+        expected_right = total_obs * (n_right / total)
 
         chi_left = np.sum((obs_left - expected_left) ** 2 / (expected_left + 1e-9))
         chi_right = np.sum((obs_right - expected_right) ** 2 / (expected_right + 1e-9))
         return chi_left + chi_right
 
-    def criterion(self, y_left, y_right, y_parent):
-        return self.chi_square(y_left, y_right)
+    def criterion_counts(self, left_counts, right_counts, parent_counts):
+        # Normalized by the node's sample count: chi-square of a 2 x k table
+        # is at most n, so the score stays in [0, 1] (the default
+        # criterion_range) and every candidate at a node is divided by the
+        # same n, so the chosen split does not change
+        return self.chi_square(left_counts, right_counts) / parent_counts.sum()
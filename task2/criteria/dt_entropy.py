@@ -7,18 +7,21 @@ class DT_Entropy(DecisionTreeBase):
     Gain = Entropy(parent) - [w_left * Entropy(left) + w_right * Entropy(right)]
     """
 
-    def __init__(self):
-        super().__init__("Entropy")
+    def __init__(self, **kwargs):
+        super().__init__("Entropy", **kwargs)
 
-    def entropy(self, y):
-        probs = np.bincount(y.astype(int)) / len(y)
+    def entropy(self, counts):
+        probs = counts / counts.sum()
         return -np.sum([p * np.log2(p) for p in probs if p > 0])
 
-    def criterion(self, y_left, y_right, y_parent):
-        parent_entropy = self.entropy(y_parent)
-        left_entropy = self.entropy(y_left)
-        right_entropy = self.entropy(y_right)
-        w_left = len(y_left) / len(y_parent)
-        w_right = len(y_right) / len(y_parent)
+    def criterion_range(self, n_classes, n_samples):
+        return np.log2(max(n_classes, 2))
+
+    def criterion_counts(self, left_counts, right_counts, parent_counts):
+        parent_entropy = self.entropy(parent_counts)
+        left_entropy = self.entropy(left_counts)
+        right_entropy = self.entropy(right_counts)
+        w_left = left_counts.sum() / parent_counts.sum()
+        w_right = right_counts.sum() / parent_counts.sum()
         info_gain = parent_entropy - (w_left * left_entropy + w_right * right_entropy)
         return info_gain
@@ -7,23 +7,23 @@ class DT_GainRatio(DecisionTreeBase):
     GainRatio = InfoGain / SplitInfo
     """
 
-    def __init__(self):
-        super().__init__("Gain Ratio")
+    def __init__(self, **kwargs):
+        super().__init__("Gain Ratio", **kwargs)
 
-    def entropy(self, y):
-        probs = np.bincount(y.astype(int)) / len(y)
+    def entropy(self, counts):
+        probs = counts / counts.sum()
         return -np.sum([p * np.log2(p) for p in probs if p > 0])
 
-    def split_info(self, y_left, y_right, y_parent):
-        sizes = np.array([len(y_left), len(y_right)]) / len(y_parent)
+    def split_info(self, left_counts, right_counts, parent_counts):
+        sizes = np.array([left_counts.sum(), right_counts.sum()]) / parent_counts.sum()
         return -np.sum([s * np.log2(s) for s in sizes if s > 0])
 
-    def criterion(self, y_left, y_right, y_parent):
-        parent_entropy = self.entropy(y_parent)
-        left_entropy = self.entropy(y_left)
-        right_entropy = self.entropy(y_right)
-        w_left = len(y_left) / len(y_parent)
-        w_right = len(y_right) / len(y_parent)
+    def criterion_counts(self, left_counts, right_counts, parent_counts):
+        parent_entropy = self.entropy(parent_counts)
+        left_entropy = self.entropy(left_counts)
+        right_entropy = self.entropy(right_counts)
+        w_left = left_counts.sum() / parent_counts.sum()
+        w_right = right_counts.sum() / parent_counts.sum()
         info_gain = parent_entropy - (w_left * left_entropy + w_right * right_entropy)
-        split_info = self.split_info(y_left, y_right, y_parent)
+        split_info = self.split_info(left_counts, right_counts, parent_counts)
         return info_gain / split_info if split_info != 0 else 0
@@ -7,18 +7,21 @@ class DT_Gini(DecisionTreeBase):
     Gain = Gini(parent) - [w_left * Gini(left) + w_right * Gini(right)]
     """
 
-    def __init__(self):
-        super().__init__("Gini Index")
+    def __init__(self, **kwargs):
+        super().__init__("Gini Index", **kwargs)
 
-    def gini(self, y):
-        probs = np.bincount(y.astype(int)) / len(y)
+    def gini(self, counts):
+        probs = counts / counts.sum()
         return 1 - np.sum(probs ** 2)
 
-    def criterion(self, y_left, y_right, y_parent):
-        parent_gini = self.gini(y_parent)
-        left_gini = self.gini(y_left)
-        right_gini = self.gini(y_right)
-        w_left = len(y_left) / len(y_parent)
-        w_right = len(y_right) / len(y_parent)
+    def criterion_range(self, n_classes, n_samples):
+        return 1 - 1 / max(n_classes, 2)
+
+    def criterion_counts(self, left_counts, right_counts, parent_counts):
+        parent_gini = self.gini(parent_counts)
+        left_gini = self.gini(left_counts)
+        right_gini = self.gini(right_counts)
+        w_left = left_counts.sum() / parent_counts.sum()
+        w_right = right_counts.sum() / parent_counts.sum()
         gain = parent_gini - (w_left * left_gini + w_right * right_gini)
         return gain
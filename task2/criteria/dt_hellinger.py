@@ -8,15 +8,14 @@ class DT_Hellinger(DecisionTreeBase):
     Gain = 1 - HellingerDistance
     """
 
-    def __init__(self):
-        super().__init__("Hellinger Distance")
+    def __init__(self, **kwargs):
+        super().__init__("Hellinger Distance", **kwargs)
 
-    def hellinger(self, y_left, y_right):
-        n_classes = max(int(y_left.max()), int(y_right.max())) + 1
-        p = np.bincount(y_left.astype(int), minlength=n_classes) / len(y_left)
-        q = np.bincount(y_right.astype(int), minlength=n_classes) / len(y_right)
+    def hellinger(self, left_counts, right_counts):
+        p = left_counts / left_counts.sum()
+        q = right_counts / right_counts.sum()
         return np.sqrt(1 - np.sum(np.sqrt(p * q)))
 
-    def criterion(self, y_left, y_right, y_parent):
+    def criterion_counts(self, left_counts, right_counts, parent_counts):
         # smaller Hellinger = better similarity, so we invert it
-        return 1 - self.hellinger(y_left, y_right)
+        return 1 - self.hellinger(left_counts, right_counts)
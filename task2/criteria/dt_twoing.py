@@ -7,15 +7,20 @@ class DT_Twoing(DecisionTreeBase):
     Gain = 0.25 * P(L) * P(R) * (Σ |p(L,j) - p(R,j)|)²
     """
 
-    def __init__(self):
-        super().__init__("Twoing Rule")
+    def __init__(self, **kwargs):
+        super().__init__("Twoing Rule", **kwargs)
 
-    def criterion(self, y_left, y_right, y_parent):
-        total = len(y_left) + len(y_right)
-        pL, pR = len(y_left) / total, len(y_right) / total
-        classes = np.unique(y_parent)
+    def criterion_range(self, n_classes, n_samples):
+        # pL * pR <= 1/4 and the summed class differences are at most 2
+        return 0.25
+
+    def criterion_counts(self, left_counts, right_counts, parent_counts):
+        n_left, n_right = left_counts.sum(), right_counts.sum()
+        total = n_left + n_right
+        pL, pR = n_left / total, n_right / total
+        classes = np.flatnonzero(parent_counts)
         diff_sum = np.sum([
-            abs(np.sum(y_left == c) / len(y_left) - np.sum(y_right == c) / len(y_right))
+            abs(left_counts[c] / n_left - right_counts[c] / n_right)
             for c in classes
         ])
         return 0.25 * pL * pR * (diff_sum ** 2)
@@ -0,0 +1,249 @@
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import KFold, StratifiedKFold
+
+from constants import datasets
+from dataset_store import load_dataset, smallest_uint
+from experiment_grid import CRITERIA, MODEL_TYPES, SPLIT_SEED, make_model
+
+
+# ------------------------------
+# Shared preprocessing
+# ------------------------------
+def rank_encode(values, max_bins=None):
+    """
+    Replaces one feature column by codes in the narrowest unsigned dtype.
+
+    Without max_bins the codes are dense ranks (0 for the smallest value),
+    so 'value <= v' and 'code <= rank(v)' select the same rows and a tree
+    fitted on ranks makes the same splits as one fitted on the values.
+    With max_bins, a column with more distinct values is cut at
+    max_bins quantile edges (as in base.out_of_core) and a code is the
+    index of the first edge >= value.
+
+    NaN gets the largest code, so it always goes right, as it does when
+    compared to a threshold.
+    """
+    values = np.asarray(values)
+    uniques, codes = np.unique(values, return_inverse=True)
+    if max_bins is not None and len(uniques) > max_bins:
+        edges = np.unique(np.nanquantile(values.astype(float), np.linspace(0, 1, max_bins)))
+        codes = np.searchsorted(edges, values, side="left")
+        return codes.astype(smallest_uint(len(edges) + 1))
+    return codes.reshape(-1).astype(smallest_uint(len(uniques)))
+
+
+def assign_folds(y, n_folds=5, stratify=True, seed=SPLIT_SEED):
+    """
+    Fold number of every row. Folds are stratified by class when every
+    class has at least n_folds rows, shuffled with 'seed' either way.
+    """
+    y = np.asarray(y)
+    if n_folds < 2 or n_folds > len(y):
+        raise ValueError(f"n_folds must be between 2 and the number of rows ({len(y)}), got {n_folds}")
+    _, class_sizes = np.unique(y, return_counts=True)
+    if stratify and class_sizes.min() >= n_folds:
+        splitter = StratifiedKFold(n_folds, shuffle=True, random_state=seed)
+    else:
+        splitter = KFold(n_folds, shuffle=True, random_state=seed)
+    fold_ids = np.empty(len(y), dtype=smallest_uint(n_folds))
+    for fold, (_, test) in enumerate(splitter.split(np.zeros(len(y)), y)):
+        fold_ids[test] = fold
+    return fold_ids
+
+
+class PreparedData:
+    """
+    A dataset encoded once and split into k folds, shared by every fold
+    and every estimator evaluated on it.
+
+    encoding:
+        "rank"  dense per-column ranks (lossless for tree splits, see
+                rank_encode); numeric columns shrink from float64 to
+                small unsigned codes, so every np.unique in the split
+                search works on narrow integers
+        "bins"  like "rank", but columns with more than max_bins
+                distinct values are reduced to max_bins quantile bins
+        None    X as given
+
+    Folds are views defined by fold_ids: fold(k) selects its rows with
+    a boolean mask, and nothing is copied until the estimator gets its
+    training rows.
+
+    Models fitted on encoded data expect encoded rows, so they are only
+    meant for scoring within the cross-validation.
+    """
+
+    def __init__(self, X, y, n_folds=5, encoding="rank", max_bins=256, stratify=True, seed=SPLIT_SEED):
+        if encoding not in ("rank", "bins", None):
+            raise ValueError(f"encoding must be 'rank', 'bins' or None, got {encoding!r}")
+        start = time.perf_counter()
+        X = np.asarray(X)
+        if encoding is not None:
+            bins = max_bins if encoding == "bins" else None
+            columns = [rank_encode(X[:, j], bins) for j in range(X.shape[1])]
+            dtype = np.result_type(*columns) if columns else X.dtype
+            X = np.empty((len(X), len(columns)), dtype=dtype)
+            for j, codes in enumerate(columns):
+                X[:, j] = codes
+        self.X = np.ascontiguousarray(X)
+        self.y = np.asarray(y)
+        self.fold_ids = assign_folds(self.y, n_folds, stratify, seed)
+        self.n_folds = n_folds
+        self.encoding = encoding
+        self.prepare_seconds = time.perf_counter() - start
+
+    @classmethod
+    def _from_arrays(cls, X, y, fold_ids):
+        data = cls.__new__(cls)
+        data.X, data.y, data.fold_ids = X, y, fold_ids
+        data.n_folds = int(fold_ids.max()) + 1
+        return data
+
+    def fold(self, k):
+        """(X_train, y_train, X_test, y_test) of fold k."""
+        test = self.fold_ids == k
+        train = ~test
+        return self.X[train], self.y[train], self.X[test], self.y[test]
+
+    def save(self, folder):
+        """Writes the arrays as .npy files that worker processes memory-map."""
+        for name in ("X", "y", "fold_ids"):
+            np.save(os.path.join(folder, f"{name}.npy"), getattr(self, name))
+        return folder
+
+    @classmethod
+    def open(cls, folder):
+        """Memory-maps the arrays written by save()."""
+        arrays = [np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r")
+                  for name in ("X", "y", "fold_ids")]
+        return cls._from_arrays(*arrays)
+
+
+# Workers run several folds of the same data; map it once per process
+_open_shared = lru_cache(maxsize=4)(PreparedData.open)
+
+
+# ------------------------------
+# Fold evaluation
+# ------------------------------
+def _fit_fold(data, estimator, k):
+    X_train, y_train, X_test, y_test = data.fold(k)
+    start = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    preds = estimator.predict(X_test)
+    return {
+        "fold": k,
+        "accuracy": float(np.mean(preds == y_test)),
+        "fit_seconds": fit_seconds,
+        "predict_seconds": time.perf_counter() - start,
+        "n_train": len(y_train),
+        "n_test": len(y_test),
+    }
+
+
+def _run_fold(job):
+    # Same reseeding as experiment_grid.run_job: bagged models in
+    # different workers must not share the inherited global RNG state
+    np.random.seed()
+    folder, estimator, k = job
+    return _fit_fold(_open_shared(folder), estimator, k)
+
+
+def cross_validate(estimators, data, n_jobs=None):
+    """
+    Scores unfitted estimators on every fold of a PreparedData.
+
+    Each (estimator, fold) pair is fitted on a fresh copy of the
+    estimator, in parallel on a process pool. Workers memory-map the
+    prepared arrays instead of receiving a copy each.
+
+    Args:
+        estimators (dict): name -> unfitted estimator (any model of this
+                           repo, or anything with fit/predict).
+        data (PreparedData): Encoded dataset and its folds.
+        n_jobs (int): Worker processes; None uses all CPUs, 1 runs inline.
+
+    Returns:
+        dict: name -> pd.DataFrame with one row per fold (fold, accuracy,
+              fit_seconds, predict_seconds, n_train, n_test).
+    """
+    jobs = [(name, k) for name in estimators for k in range(data.n_folds)]
+    if n_jobs == 1:
+        results = [_fit_fold(data, deepcopy(estimators[name]), k) for name, k in jobs]
+    else:
+        with tempfile.TemporaryDirectory(prefix="cv_") as folder:
+            data.save(folder)
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                results = list(pool.map(_run_fold, [(folder, estimators[name], k) for name, k in jobs]))
+
+    scores = {name: [] for name in estimators}
+    for (name, _), result in zip(jobs, results):
+        scores[name].append(result)
+    return {name: pd.DataFrame(rows) for name, rows in scores.items()}
+
+
+def summarize(scores):
+    """One row per estimator: mean and standard deviation over the folds."""
+    rows = []
+    for name, folds in scores.items():
+        rows.append({
+            "Model": name,
+            "Accuracy": folds["accuracy"].mean(),
+            "Accuracy Std": folds["accuracy"].std(ddof=1),
+            "Fit Seconds": folds["fit_seconds"].mean(),
+            "Predict Seconds": folds["predict_seconds"].mean(),
+        })
+    return pd.DataFrame(rows)
+
+# ------------------------------
+# MAIN
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="k-fold cross-validation of every criterion and wrapper.")
+    parser.add_argument("--folds", type=int, default=10)
+    parser.add_argument("--criteria", nargs="*", default=list(CRITERIA), choices=list(CRITERIA))
+    parser.add_argument("--model-types", nargs="*", default=list(MODEL_TYPES), choices=list(MODEL_TYPES))
+    parser.add_argument("--n-estimators", type=int, default=50)
+    parser.add_argument("--encoding", default="rank", choices=["rank", "bins", "none"])
+    parser.add_argument("--max-bins", type=int, default=256)
+    parser.add_argument("--n-jobs", type=int, default=None)
+    parser.add_argument("--out", default="results/cross_validation.csv")
+    args = parser.parse_args()
+
+    all_folds = []
+    for d in datasets:
+        try:
+            X, y = load_dataset(d, missing="drop")
+            data = PreparedData(X, y, args.folds, None if args.encoding == "none" else args.encoding,
+                                args.max_bins)
+        except Exception as e:
+            print(f"Skipping {d['name']} due to error: {e}")
+            continue
+
+        estimators = {(criterion, model_type): make_model(criterion, model_type, args.n_estimators)
+                      for criterion in args.criteria for model_type in args.model_types}
+        scores = cross_validate(estimators, data, args.n_jobs)
+
+        print(f"\n{d['name']} ({len(y)} rows, {args.folds} folds, prepared in {data.prepare_seconds * 1000:.1f} ms)")
+        for (criterion, model_type), folds in scores.items():
+            acc = folds["accuracy"]
+            print(f"  {criterion:10s} | {model_type:6s} | Accuracy: {acc.mean():.4f} ± {acc.std(ddof=1):.4f} | "
+                  f"fit {folds['fit_seconds'].mean() * 1000:8.1f} ms/fold")
+            all_folds.append(folds.assign(**{"Dataset": d["name"], "Base Criterion": criterion,
+                                             "Model Type": model_type}))
+
+    if all_folds:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        pd.concat(all_folds, ignore_index=True).to_csv(args.out, index=False)
+        print(f"\nPer-fold results saved to {args.out}")
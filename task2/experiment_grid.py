@@ -0,0 +1,210 @@
+import csv
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from criteria.dt_entropy import DT_Entropy
+from criteria.dt_gini import DT_Gini
+from criteria.dt_gain_ratio import DT_GainRatio
+from criteria.dt_chi_square import DT_ChiSquare
+from criteria.dt_hellinger import DT_Hellinger
+from criteria.dt_twoing import DT_Twoing
+
+from base.pruning_wrapper import PruningWrapper
+from base.bagging_wrapper import BaggingWrapper
+from base.introspection import model_summary
+
+from dataset_store import load_dataset
+from fit_cache import FitCache
+
+# ------------------------------
+# Grid axes
+# ------------------------------
+CRITERIA = {
+    "Entropy": DT_Entropy,
+    "Gini": DT_Gini,
+    "Gain Ratio": DT_GainRatio,
+    "Chi-Square": DT_ChiSquare,
+    "Hellinger": DT_Hellinger,
+    "Twoing": DT_Twoing,
+}
+
+MODEL_TYPES = {
+    "Base": lambda tree, n_est: tree,
+    "Pruned": lambda tree, n_est: PruningWrapper(tree),
+    "Bagged": lambda tree, n_est: BaggingWrapper(tree, n_est),
+    "Hybrid": lambda tree, n_est: BaggingWrapper(PruningWrapper(tree), n_est),
+}
+
+# One row per finished job; the first three match the old result CSVs,
+# the size columns come from base.introspection.model_summary
+SIZE_FIELDS = ["n_trees", "n_nodes", "n_leaves", "depth", "memory_bytes", "serialized_bytes"]
+FIELDS = ["Dataset", "Criterion", "Accuracy", "Base Criterion", "Model Type", "Seconds"] + SIZE_FIELDS
+
+# train_test_split seed shared by every job (and part of the fit-cache key)
+SPLIT_SEED = 42
+
+
+def make_model(criterion, model_type, n_estimators=50):
+    """Builds one grid cell, e.g. make_model("Gini", "Hybrid")."""
+    return MODEL_TYPES[model_type](CRITERIA[criterion](), n_estimators)
+
+
+def _split(dataset, missing, test_size):
+    X, y = load_dataset(dataset, missing=missing)
+    return train_test_split(X, y, test_size=test_size, random_state=SPLIT_SEED)
+
+
+def run_job(job):
+    """
+    Fits and scores one (dataset, criterion, model type) cell.
+    Runs in a worker process; returns (served from the fit cache,
+    result row for the store).
+    """
+    # Forked workers inherit the parent's global RNG state; reseed so
+    # bagged models in different workers draw different bootstraps
+    np.random.seed()
+    X_train, X_test, y_train, y_test = _split(job["dataset"], job["missing"], job["test_size"])
+    model = make_model(job["criterion"], job["model_type"], job["n_estimators"])
+
+    start = time.perf_counter()
+    if job["fit_cache"] is None:
+        model.fit(X_train, y_train)
+        preds, cached = model.predict(X_test), False
+    else:
+        model, preds, cached = FitCache(job["fit_cache"]).fit_predict(
+            model, X_train, y_train, X_test, split_seed=SPLIT_SEED)
+    acc = float(np.mean(preds == y_test))
+    return cached, {
+        "Dataset": job["dataset"]["name"],
+        "Criterion": model.name,
+        "Accuracy": acc,
+        "Base Criterion": job["criterion"],
+        "Model Type": job["model_type"],
+        "Seconds": round(time.perf_counter() - start, 3),
+        **model_summary(model),
+    }
+
+
+def _upgrade_store(results_path):
+    """
+    Rewrites a store written with older columns under the current FIELDS.
+    Rows lacking a current column are dropped, so those jobs run again
+    (usually straight from the fit cache).
+    """
+    with open(results_path, newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None or reader.fieldnames == FIELDS:
+            return
+        rows = [r for r in reader if all(r.get(k) not in (None, "") for k in FIELDS)]
+    with open(results_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _done_keys(results_path):
+    """(dataset, criterion, model type) cells already in the store."""
+    if not os.path.exists(results_path):
+        return set()
+    with open(results_path, newline="") as f:
+        return {(r["Dataset"], r["Base Criterion"], r["Model Type"]) for r in csv.DictReader(f)}
+
+
+def run_grid(datasets, results_path, criteria=None, model_types=None, n_estimators=50,
+             missing="drop", test_size=0.3, min_train_rows=20, n_jobs=None,
+             fit_cache=True, log=print):
+    """
+    Expands datasets x criteria x model types into independent jobs and
+    runs them on a process pool.
+
+    Every finished job is appended to the CSV at 'results_path' right away,
+    and jobs already recorded there are skipped, so an interrupted run
+    resumes where it stopped. Failed jobs are reported and not recorded,
+    so they are retried on the next run.
+
+    Args:
+        datasets (list): Entries of constants.datasets.
+        results_path (str): CSV results store (created if missing).
+        criteria, model_types (list): Subsets of CRITERIA / MODEL_TYPES.
+        n_jobs (int): Worker processes; None uses all CPUs, 1 runs inline.
+        min_train_rows (int): Datasets with fewer training rows are skipped.
+        fit_cache (bool or str): Reuse fitted models through fit_cache.FitCache
+                                 (True: default directory, str: cache directory).
+
+    Returns:
+        pd.DataFrame: Every row in the store.
+    """
+    criteria = list(criteria or CRITERIA)
+    model_types = list(model_types or MODEL_TYPES)
+    if os.path.exists(results_path):
+        _upgrade_store(results_path)
+    done = _done_keys(results_path)
+    if fit_cache:
+        cache_dir = FitCache(None if fit_cache is True else fit_cache).cache_dir
+    else:
+        cache_dir = None
+
+    jobs = []
+    for d in datasets:
+        # Load once in the parent so the cache is filled before workers read it
+        try:
+            y_train = _split(d, missing, test_size)[2]
+        except Exception as e:
+            log(f"Skipping {d['name']} due to error: {e}")
+            continue
+        if len(y_train) < min_train_rows:
+            log(f"Skipping {d['name']} (dataset too small for pruning split)")
+            continue
+        for criterion in criteria:
+            for model_type in model_types:
+                if (d["name"], criterion, model_type) in done:
+                    continue
+                jobs.append({"dataset": d, "criterion": criterion, "model_type": model_type,
+                             "n_estimators": n_estimators, "missing": missing, "test_size": test_size,
+                             "fit_cache": cache_dir})
+
+    log(f"{len(jobs)} jobs to run, {len(done)} already recorded in {results_path}")
+    folder = os.path.dirname(results_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    write_header = not os.path.exists(results_path) or os.path.getsize(results_path) == 0
+
+    with open(results_path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        if write_header:
+            writer.writeheader()
+
+        def record(job, result=None, error=None):
+            label = f"{job['dataset']['name']} | {job['criterion']} | {job['model_type']}"
+            if error is not None:
+                log(f"{label:60s} | FAILED ({error})")
+                return
+            cached, row = result
+            writer.writerow(row)
+            f.flush()
+            source = "cached" if cached else f"{row['Seconds']:.1f}s"
+            log(f"{label:60s} | Accuracy: {row['Accuracy']:.4f} ({source})")
+
+        if n_jobs == 1:
+            for job in jobs:
+                try:
+                    record(job, run_job(job))
+                except Exception as e:
+                    traceback.print_exc()
+                    record(job, error=e)
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                futures = {pool.submit(run_job, job): job for job in jobs}
+                for future in as_completed(futures):
+                    try:
+                        record(futures[future], future.result())
+                    except Exception as e:
+                        record(futures[future], error=e)
+
+    return pd.read_csv(results_path)
@@ -0,0 +1,118 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+
+import numpy as np
+
+# ------------------------------
+# Cache location
+# ------------------------------
+_HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("DT_FIT_CACHE", os.path.join(_HERE, "fit_cache"))
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """Digest of the model code (base/ and criteria/); any edit invalidates old fits."""
+    digest = hashlib.sha256()
+    for package in ("base", "criteria"):
+        folder = os.path.join(_HERE, package)
+        for fname in sorted(os.listdir(folder)):
+            if fname.endswith(".py"):
+                digest.update(fname.encode())
+                with open(os.path.join(folder, fname), "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def describe_estimator(model):
+    """
+    Class and constructor parameters of an (unfitted) estimator, with
+    nested base estimators described recursively. Parameters are read
+    from the attributes named like the __init__ arguments along the MRO.
+    """
+    params = {}
+    for cls in type(model).__mro__:
+        if "__init__" not in vars(cls):
+            continue
+        for name in inspect.signature(cls.__init__).parameters:
+            if name in params or name == "self" or not hasattr(model, name):
+                continue
+            value = getattr(model, name)
+            if hasattr(value, "fit"):
+                value = describe_estimator(value)
+            params[name] = value
+    return {"class": f"{type(model).__module__}.{type(model).__qualname__}", "params": params}
+
+
+def _array_digest(digest, array):
+    array = np.ascontiguousarray(array)
+    digest.update(f"{array.dtype.str}{array.shape}".encode())
+    digest.update(array.tobytes())
+
+
+class FitCache:
+    """
+    Content-addressed store of fitted models and their test predictions.
+
+    The key hashes the training and test data, the split seed, the
+    estimator class with its hyperparameters, and code_version(). Any
+    script fitting the same configuration on the same split therefore
+    reuses the stored model instead of training again. Unseeded
+    estimators (random_state=None) reuse whichever fit was stored first.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, model, X_train, y_train, X_test, split_seed=None):
+        digest = hashlib.sha256()
+        for array in (X_train, y_train, X_test):
+            _array_digest(digest, array)
+        spec = {"split_seed": split_seed, "estimator": describe_estimator(model), "code": code_version()}
+        digest.update(json.dumps(spec, sort_keys=True, default=repr).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+
+    def get(self, key):
+        """Returns (fitted model, test predictions) or None."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            entry = pickle.load(f)
+        return entry["model"], entry["predictions"]
+
+    def put(self, key, model, predictions):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so concurrent workers never read a partial file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"model": model, "predictions": predictions}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def fit_predict(self, model, X_train, y_train, X_test, split_seed=None):
+        """
+        Fits 'model' and predicts X_test, or loads both from the cache.
+
+        Returns:
+            (fitted model, predictions, True if served from the cache)
+        """
+        key = self.key(model, X_train, y_train, X_test, split_seed)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached[0], cached[1], True
+        self.misses += 1
+        model.fit(X_train, y_train)
+        predictions = model.predict(X_test)
+        self.put(key, model, predictions)
+        return model, predictions, False
@@ -1,7 +1,6 @@
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
 
 # Import your base trees from Task 1
 from criteria.dt_entropy import DT_Entropy
@@ -14,6 +13,7 @@ from criteria.dt_twoing import DT_Twoing
 # Import the new BaggingWrapper
 from base.bagging_wrapper import BaggingWrapper
 from constants import datasets
+from dataset_store import load_dataset
 
 # -------------------------------------------------------------------------
 # Define all splitting-criterion models, wrapped in Bagging
@@ -45,13 +45,8 @@ models = [
 # -------------------------------------------------------------------------
 # Helper: load and encode categorical data (Same as Task 1)
 # -------------------------------------------------------------------------
-def load_and_preprocess(url, cols):
-    df = pd.read_csv(url, names=cols)
-    le = LabelEncoder()
-    for c in df.columns:
-        df[c] = le.fit_transform(df[c].astype(str))
-    X = df.drop("class", axis=1, errors="ignore").values
-    y = df["class"].values
+def load_and_preprocess(dataset):
+    X, y = load_dataset(dataset)
     return train_test_split(X, y, test_size=0.3, random_state=42)
 
 
@@ -63,7 +58,7 @@ results = []
 for d in datasets:
     print(f"\n=== Dataset: {d['name']} ===")
     try:
-        X_train, X_test, y_train, y_test = load_and_preprocess(d["url"], d["cols"])
+        X_train, X_test, y_train, y_test = load_and_preprocess(d)
     except Exception as e:
         print(f"Skipping {d['name']} due to error: {e}")
         continue
@@ -78,8 +73,10 @@ for d in datasets:
             
             acc1 = np.mean(preds1 == y_test)
             acc2 = np.mean(preds2 == y_test)
-            results.append({"Dataset": d["name"], "Criterion": m1.name, "Accuracy": acc1})
-            results.append({"Dataset": d["name"], "Criterion": m2.name, "Accuracy": acc2})
+            results.append({"Dataset": d["name"], "Criterion": m1.name, "Accuracy": acc1,
+                            **m1.summary()})
+            results.append({"Dataset": d["name"], "Criterion": m2.name, "Accuracy": acc2,
+                            **m2.summary()})
             print(f"{m1.name:25s} | Accuracy: {acc1:.4f}")
             print(f"{m2.name:25s} | Accuracy: {acc2:.4f}")
         except Exception as e:
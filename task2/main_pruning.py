@@ -1,7 +1,6 @@
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
 import os
 
 # Import your base trees from Task 1
@@ -15,6 +14,7 @@ from criteria.dt_twoing import DT_Twoing
 # Import the new PruningWrapper
 from base.pruning_wrapper import PruningWrapper
 from constants import datasets
+from dataset_store import load_dataset
 
 # -------------------------------------------------------------------------
 # Define all splitting-criterion models
@@ -45,14 +45,8 @@ models_pruned = [
 # Helper: load and encode categorical data
 # (Using the improved version from plot.py that handles '?' as NA)
 # -------------------------------------------------------------------------
-def load_and_preprocess(url, cols):
-    df = pd.read_csv(url, names=cols, na_values='?')
-    df = df.dropna()  # Drop rows with missing values
-    le = LabelEncoder()
-    for c in df.columns:
-        df[c] = le.fit_transform(df[c].astype(str))
-    X = df.drop("class", axis=1, errors="ignore").values
-    y = df["class"].values
+def load_and_preprocess(dataset):
+    X, y = load_dataset(dataset, missing="drop")  # Drop rows with missing values
     return train_test_split(X, y, test_size=0.3, random_state=42)
 
 
@@ -64,7 +58,7 @@ results = []
 for d in datasets:
     print(f"\n=== Dataset: {d['name']} ===")
     try:
-        X_train, X_test, y_train, y_test = load_and_preprocess(d["url"], d["cols"])
+        X_train, X_test, y_train, y_test = load_and_preprocess(d)
         
         # Handle small datasets that might fail on validation split
         if len(y_train) < 20:
@@ -82,14 +76,16 @@ for d in datasets:
             m_base.fit(X_train, y_train)
             preds_base = m_base.predict(X_test)
             acc_base = np.mean(preds_base == y_test)
-            results.append({"Dataset": d["name"], "Criterion": m_base.name, "Accuracy": acc_base})
+            results.append({"Dataset": d["name"], "Criterion": m_base.name, "Accuracy": acc_base,
+                            **m_base.summary()})
             print(f"{m_base.name:25s} | Accuracy: {acc_base:.4f}")
 
             # --- Pruned Model ---
             m_pruned.fit(X_train, y_train)
             preds_pruned = m_pruned.predict(X_test)
             acc_pruned = np.mean(preds_pruned == y_test)
-            results.append({"Dataset": d["name"], "Criterion": m_pruned.name, "Accuracy": acc_pruned})
+            results.append({"Dataset": d["name"], "Criterion": m_pruned.name, "Accuracy": acc_pruned,
+                            **m_pruned.summary()})
             print(f"{m_pruned.name:25s} | Accuracy: {acc_pruned:.4f}")
 
         except Exception as e:
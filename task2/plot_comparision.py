@@ -1,29 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
 import time
-import ssl
 import os
 
-# Disable SSL issues
-ssl._create_default_https_context = ssl._create_unverified_context
-
-# ------------------------------
-# Import your actual model classes
-# ------------------------------
-from criteria.dt_entropy import DT_Entropy
-from criteria.dt_gini import DT_Gini
-from criteria.dt_gain_ratio import DT_GainRatio
-from criteria.dt_chi_square import DT_ChiSquare
-from criteria.dt_hellinger import DT_Hellinger
-from criteria.dt_twoing import DT_Twoing
-
-from base.pruning_wrapper import PruningWrapper
-from base.bagging_wrapper import BaggingWrapper
-
 from constants import datasets
+from experiment_grid import run_grid
 
 # ------------------------------
 # Logger
@@ -31,119 +13,6 @@ from constants import datasets
 def log(msg):
     print(f"[{time.strftime('%H:%M:%S')}] {msg}")
 
-# ------------------------------
-# Normalize criterion names
-# ------------------------------
-def normalize_criterion(name):
-    n = name.lower().replace("-", " ").replace("_", " ")
-
-    if "entropy" in n: return "Entropy"
-    if "gini" in n: return "Gini"
-    if "gain" in n: return "Gain Ratio"
-    if "chi" in n: return "Chi-Square"
-    if "hell" in n: return "Hellinger"
-    if "two" in n: return "Twoing"
-
-    return name
-
-# ------------------------------
-# Load dataset
-# ------------------------------
-def load_dataset(url, cols):
-    import pandas as pd
-    log("Loading dataset...")
-    df = pd.read_csv(url, names=cols, na_values="?").dropna()
-    log(f"Rows after dropna: {len(df)}")
-
-    le = LabelEncoder()
-    for c in df.columns:
-        df[c] = le.fit_transform(df[c].astype(str))
-
-    X = df.drop("class", axis=1).values
-    y = df["class"].values
-
-    log("Dataset loaded & encoded.")
-    return train_test_split(X, y, test_size=0.3, random_state=42)
-
-# ------------------------------
-# Build 24 models
-# ------------------------------
-def build_models():
-    log("Building model objects...")
-    n_est = 50
-
-    base = [
-        DT_Entropy(), DT_Gini(), DT_GainRatio(),
-        DT_ChiSquare(), DT_Hellinger(), DT_Twoing()
-    ]
-
-    pruned = [
-        PruningWrapper(DT_Entropy()),
-        PruningWrapper(DT_Gini()),
-        PruningWrapper(DT_GainRatio()),
-        PruningWrapper(DT_ChiSquare()),
-        PruningWrapper(DT_Hellinger()),
-        PruningWrapper(DT_Twoing())
-    ]
-
-    bagged = [
-        BaggingWrapper(DT_Entropy(), n_est),
-        BaggingWrapper(DT_Gini(), n_est),
-        BaggingWrapper(DT_GainRatio(), n_est),
-        BaggingWrapper(DT_ChiSquare(), n_est),
-        BaggingWrapper(DT_Hellinger(), n_est),
-        BaggingWrapper(DT_Twoing(), n_est)
-    ]
-
-    hybrid = [
-        BaggingWrapper(PruningWrapper(DT_Entropy()), n_est),
-        BaggingWrapper(PruningWrapper(DT_Gini()), n_est),
-        BaggingWrapper(PruningWrapper(DT_GainRatio()), n_est),
-        BaggingWrapper(PruningWrapper(DT_ChiSquare()), n_est),
-        BaggingWrapper(PruningWrapper(DT_Hellinger()), n_est),
-        BaggingWrapper(PruningWrapper(DT_Twoing()), n_est)
-    ]
-
-    return base, pruned, bagged, hybrid
-
-# ------------------------------
-# Evaluate 24 models → accuracy list
-# ------------------------------
-def evaluate(dataset):
-    log(f"Evaluating dataset: {dataset['name']}")
-    X_train, X_test, y_train, y_test = load_dataset(dataset["url"], dataset["cols"])
-
-    models_base, models_pruned, models_bagged, models_hybrid = build_models()
-
-    accuracies = []
-
-    for i in range(6):
-        m_b  = models_base[i]
-        m_p  = models_pruned[i]
-        m_bg = models_bagged[i]
-        m_h  = models_hybrid[i]
-
-        base_name = normalize_criterion(m_b.name)
-        log(f"\n------ Criterion: {base_name} ------")
-
-        group = [
-            (m_b,  "Base"),
-            (m_p,  "Pruned"),
-            (m_bg, "Bagged"),
-            (m_h,  "Hybrid")
-        ]
-
-        for model, model_type in group:
-            log(f"Fitting {model.name} ({model_type})...")
-            model.fit(X_train, y_train)
-            preds = model.predict(X_test)
-            acc = float(np.mean(preds == y_test))
-            log(f"Accuracy: {acc:.4f}")
-            accuracies.append((base_name, model_type, acc))
-
-    return accuracies
-
-
 # ------------------------------
 # Plotting function
 # ------------------------------
@@ -279,9 +148,16 @@ if __name__ == "__main__":
 
     os.makedirs("plots", exist_ok=True)
 
+    # Same grid as main_hybrid.py, so both share (and resume) one results store
+    df = run_grid(datasets, "results/all_models_10_datasets.csv",
+                  model_types=["Base", "Pruned", "Bagged", "Hybrid"],
+                  n_estimators=50, missing="drop", log=log)
+
     for dataset in datasets:
-        log(f"\n\n=== Processing dataset: {dataset['name']} ===")
-        acc_list = evaluate(dataset)
+        rows = df[df["Dataset"] == dataset["name"]]
+        if rows.empty:
+            continue
+        acc_list = list(rows[["Base Criterion", "Model Type", "Accuracy"]].itertuples(index=False, name=None))
 
         safe_name = dataset["name"].replace(" ", "_").lower()
         save_path = f"plots/{safe_name}.png"
@@ -0,0 +1,89 @@
+import argparse
+import sys
+
+import numpy as np
+
+from benchmark import _best_time
+from experiment_grid import CRITERIA
+from synthetic import make_classification_data
+
+# ------------------------------
+# Scaling checks
+# ------------------------------
+# A level of the tree sorts each feature of the rows it holds, so fit
+# should cost O(n log n) per level at fixed depth and predict O(n).
+# Over a doubling range of sizes, log(time) vs log(n) then has a slope
+# of about 1 (n log n adds ~0.1). A quadratic step would give ~2.
+FIT_MAX_EXPONENT = 1.35
+PREDICT_MAX_EXPONENT = 1.25
+
+# Data shapes checked by default. Categorical columns have only
+# 'cardinality' distinct values, so work done per distinct value stays
+# linear there; a numeric column has ~n distinct values and exposes any
+# per-value pass over the rows as ~n^2. Numeric fits cost far more per
+# row, hence the smaller sizes.
+SHAPES = {
+    "categorical": {"n_numeric": 0, "sizes": [20_000, 40_000, 80_000, 160_000, 320_000]},
+    "numeric": {"n_numeric": 1, "sizes": [2_500, 5_000, 10_000, 20_000, 40_000]},
+}
+
+
+def scaling_exponent(sizes, seconds):
+    """Least-squares slope of log(seconds) against log(sizes)."""
+    return float(np.polyfit(np.log(sizes), np.log(seconds), 1)[0])
+
+
+def check_criterion(criterion, sizes, n_features=10, cardinality=8, n_numeric=1, repeat=3, log=print):
+    """
+    Fits CRITERIA[criterion] at every size and asserts that fit and
+    predict time grow no faster than the expected complexity. Keep at
+    least one numeric column (see SHAPES) to catch per-value blowups.
+    Returns (fit exponent, predict exponent).
+    """
+    fit_seconds, predict_seconds = [], []
+    for n in sizes:
+        X, y = make_classification_data(n, n_features, cardinality, n_numeric=n_numeric, seed=n)
+        model = CRITERIA[criterion]()
+        fit_seconds.append(_best_time(lambda: model.fit(X, y), repeat))
+        predict_seconds.append(_best_time(lambda: model.predict(X), repeat))
+        log(f"{criterion:10s} | n={n:>9,d} | fit {fit_seconds[-1]:8.3f}s | predict {predict_seconds[-1]:8.3f}s")
+
+    fit_exp = scaling_exponent(sizes, fit_seconds)
+    predict_exp = scaling_exponent(sizes, predict_seconds)
+    log(f"{criterion:10s} | exponents: fit {fit_exp:.2f}, predict {predict_exp:.2f}")
+    assert fit_exp <= FIT_MAX_EXPONENT, \
+        f"{criterion} fit scales as n^{fit_exp:.2f}, expected at most n^{FIT_MAX_EXPONENT} (~n log n)"
+    assert predict_exp <= PREDICT_MAX_EXPONENT, \
+        f"{criterion} predict scales as n^{predict_exp:.2f}, expected at most n^{PREDICT_MAX_EXPONENT} (~n)"
+    return fit_exp, predict_exp
+
+# ------------------------------
+# MAIN
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Assert that tree fit/predict time scales as expected with n.")
+    parser.add_argument("--shapes", nargs="*", default=list(SHAPES), choices=list(SHAPES))
+    parser.add_argument("--sizes", type=int, nargs="*", default=None, help="override every shape's sizes")
+    parser.add_argument("--criteria", nargs="*", default=list(CRITERIA), choices=list(CRITERIA))
+    parser.add_argument("--numeric", type=int, default=None,
+                        help="numeric (continuous) features of the 'numeric' shape")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    failures = []
+    for shape in args.shapes:
+        sizes = args.sizes or SHAPES[shape]["sizes"]
+        n_numeric = SHAPES[shape]["n_numeric"]
+        if shape == "numeric" and args.numeric is not None:
+            n_numeric = args.numeric
+        print(f"--- {shape} features ({n_numeric} numeric) ---")
+        for criterion in args.criteria:
+            try:
+                check_criterion(criterion, sizes, n_numeric=n_numeric, repeat=args.repeat)
+            except AssertionError as e:
+                failures.append(f"[{shape}] {e}")
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nAll scaling checks passed.")
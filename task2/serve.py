@@ -0,0 +1,245 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from base.model_io import load_model
+
+# ------------------------------
+# Micro-batching
+# ------------------------------
+class MicroBatcher:
+    """
+    Coalesces concurrent prediction requests into one batch predict call.
+
+    A batch is flushed as soon as it holds 'max_batch_size' rows or the
+    oldest waiting request has waited 'max_wait_ms', whichever comes first.
+    Under light load a request is answered after at most max_wait_ms; under
+    heavy load batches fill up immediately and the per-row cost of the
+    Python traversal is replaced by one vectorized predict per batch.
+    """
+
+    def __init__(self, predict, max_batch_size=256, max_wait_ms=2.0):
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.rows = 0
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, rows):
+        """Queues a 2-D block of rows and waits for its predictions."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Block until there is work, then gather more until full or timed out
+            pending = [await self.queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            try:
+                batch = np.concatenate([rows for rows, _ in pending])
+                # Keep the event loop responsive while the batch is scored
+                preds = await loop.run_in_executor(None, self.predict, batch)
+            except Exception as e:
+                # Fail this batch's requests only; the worker keeps serving
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.rows += len(batch)
+            start = 0
+            for rows, future in pending:
+                if not future.done():
+                    future.set_result(preds[start:start + len(rows)])
+                start += len(rows)
+
+# ------------------------------
+# Minimal HTTP/1.1 front end
+# ------------------------------
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error"}
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def _to_python(preds):
+    return [p.item() if hasattr(p, "item") else p for p in preds]
+
+
+def _input_width(model):
+    """
+    (exact, minimum) row width the model accepts. Files written before
+    the width was recorded only give the minimum: one past the highest
+    feature any split reads.
+    """
+    trees = getattr(model, "trees", [model])
+    used = max((int(t.feature.max()) for t in trees if len(t.feature)), default=-1) + 1
+    return getattr(model, "n_features_in_", None), used
+
+
+async def _handle_request(batcher, model, method, target, body):
+    """
+    Routes one request. Returns (status, JSON payload).
+
+    POST /predict  {"row": [...]}        -> {"prediction": label}
+    POST /predict  {"rows": [[...], ...]} -> {"predictions": [labels]}
+    GET  /health                          -> model name and batching stats
+    """
+    if target == "/health":
+        return 200, {"model": model.name, "batches": batcher.batches, "rows": batcher.rows}
+    if target != "/predict":
+        return 404, {"error": f"unknown path {target}"}
+    if method != "POST":
+        return 405, {"error": "use POST"}
+
+    try:
+        request = json.loads(body or b"{}")
+        if "row" in request:
+            rows = np.asarray([request["row"]], dtype=float)
+        else:
+            rows = np.asarray(request["rows"], dtype=float)
+        if rows.ndim != 2:
+            raise ValueError("rows must be a list of equal-length lists")
+        exact, minimum = _input_width(model)
+        if exact is not None and rows.shape[1] != exact:
+            raise ValueError(f"rows must have {exact} features, got {rows.shape[1]}")
+        if rows.shape[1] < minimum:
+            raise ValueError(f"rows must have at least {minimum} features, got {rows.shape[1]}")
+        # Without a recorded width, drop unused trailing columns so
+        # every row in a batch has the same width
+        rows = rows[:, :minimum] if exact is None else rows
+    except (ValueError, KeyError, TypeError) as e:
+        return 400, {"error": str(e)}
+
+    try:
+        preds = _to_python(await batcher.submit(rows))
+    except Exception as e:
+        return 500, {"error": f"prediction failed: {e}"}
+    if "row" in request:
+        return 200, {"prediction": preds[0]}
+    return 200, {"predictions": preds}
+
+
+async def _serve_connection(batcher, model, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                writer.write(_response(400, {"error": "malformed request line"}, False))
+                break
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", 0))
+            body = await reader.readexactly(length) if length else b""
+
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            try:
+                status, payload = await _handle_request(batcher, model, method, target, body)
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(model_path, host="127.0.0.1", port=8000, unix_socket=None,
+                max_batch_size=256, max_wait_ms=2.0):
+    """
+    Loads a model saved with base.model_io.save_model and serves it over
+    HTTP on host:port, or on a Unix domain socket if 'unix_socket' is set.
+    """
+    model = load_model(model_path)
+    batcher = MicroBatcher(model.predict, max_batch_size, max_wait_ms)
+    batcher.start()
+
+    def handler(reader, writer):
+        return _serve_connection(batcher, model, reader, writer)
+
+    if unix_socket:
+        server = await asyncio.start_unix_server(handler, path=unix_socket)
+        where = unix_socket
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        where = f"http://{host}:{port}"
+    print(f"[{time.strftime('%H:%M:%S')}] Serving {model.name} on {where}")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+# ------------------------------
+# MAIN
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a saved decision tree model over HTTP.")
+    parser.add_argument("model", help="model file written by base.model_io.save_model")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix-socket", default=None, help="serve on this Unix socket instead of TCP")
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.model, args.host, args.port, args.unix_socket,
+                          args.max_batch_size, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,57 @@
+import numpy as np
+
+from dataset_store import smallest_uint
+
+
+def make_classification_data(n_rows, n_features=10, cardinality=8, n_classes=3, n_numeric=0,
+                             noise=0.1, seed=0, block_size=1_000_000):
+    """
+    Synthetic classification data in the layout load_dataset produces.
+
+    The first n_features - n_numeric columns are categorical codes in
+    [0, cardinality), the rest are standard-normal numeric columns. The
+    class is a fixed function of the first few features (so trees have
+    real structure to find) with a 'noise' fraction of random labels.
+
+    Rows are generated in blocks, so 10^7 rows need little more memory
+    than the result: one byte per categorical cell when every feature is
+    categorical, float64 otherwise.
+
+    Returns:
+        (X, y): C-contiguous X and compact unsigned y.
+    """
+    if not 0 <= n_numeric <= n_features:
+        raise ValueError(f"n_numeric must be between 0 and n_features, got {n_numeric}")
+    rng = np.random.RandomState(seed)
+    n_categorical = n_features - n_numeric
+    X = np.empty((n_rows, n_features), dtype=np.float64 if n_numeric else smallest_uint(cardinality))
+    y = np.empty(n_rows, dtype=smallest_uint(n_classes))
+
+    for start in range(0, n_rows, block_size):
+        stop = min(start + block_size, n_rows)
+        block = X[start:stop]
+        block[:, :n_categorical] = rng.randint(0, cardinality, size=(stop - start, n_categorical))
+        if n_numeric:
+            block[:, n_categorical:] = rng.randn(stop - start, n_numeric)
+
+        # Class signal: a few categorical codes and the sign of the first numeric column
+        signal = np.zeros(stop - start, dtype=np.int64)
+        for j in range(min(n_categorical, 3)):
+            signal += (j + 1) * block[:, j].astype(np.int64)
+        if n_numeric:
+            signal += (block[:, n_categorical] > 0).astype(np.int64)
+        labels = signal % n_classes
+        flip = rng.rand(stop - start) < noise
+        labels[flip] = rng.randint(0, n_classes, size=flip.sum())
+        y[start:stop] = labels
+    return X, y
+
+
+def like_dataset(dataset, n_rows, cardinality=5, n_classes=3, seed=0):
+    """
+    Synthetic data shaped like a constants.datasets entry: the same
+    number of features and of numeric columns, at any number of rows.
+    """
+    n_features = len([c for c in dataset["cols"] if c != "class"])
+    n_numeric = len(dataset.get("numeric", ()))
+    return make_classification_data(n_rows, n_features, cardinality, n_classes, n_numeric, seed=seed)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The modules import each other as top-level names (base., criteria.,
+# synthetic), as when the scripts run from task2/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,21 @@
+import numpy as np
+
+from base.bagging_wrapper import BaggingWrapper
+from base.hoeffding_tree import HoeffdingTree
+from criteria.dt_gini import DT_Gini
+from synthetic import make_classification_data
+
+
+def test_online_ensemble_probabilities_stay_valid():
+    X, y = make_classification_data(20_000, n_features=6, cardinality=5, n_numeric=2, noise=0.2, seed=1)
+    ensemble = BaggingWrapper(HoeffdingTree(DT_Gini(max_depth=6), grace_period=100),
+                              n_estimators=5, random_state=0, voting="soft")
+    for start in range(0, len(y), 1_000):
+        ensemble.partial_fit(X[start:start + 1_000], y[start:start + 1_000])
+
+    for estimator in ensemble.estimators:
+        assert estimator.node_counts_.min() >= 0
+    proba = ensemble.predict_proba(X)
+    assert proba.min() >= 0 and proba.max() <= 1
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0)
+    assert set(np.unique(ensemble.predict(X))) <= set(ensemble.classes_)
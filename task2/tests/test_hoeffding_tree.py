@@ -0,0 +1,22 @@
+import numpy as np
+
+from base.hoeffding_tree import HoeffdingTree
+from criteria.dt_gini import DT_Gini
+from synthetic import make_classification_data
+
+
+def _stream(tree, X, y, batch_size=1_000):
+    for start in range(0, len(y), batch_size):
+        tree.partial_fit(X[start:start + batch_size], y[start:start + batch_size])
+
+
+def test_counts_and_probabilities_stay_valid_on_long_stream():
+    X, y = make_classification_data(40_000, n_features=6, cardinality=5, n_numeric=2, noise=0.2, seed=0)
+    tree = HoeffdingTree(DT_Gini(max_depth=8), grace_period=100)
+    _stream(tree, X, y)
+
+    assert len(tree.node_counts_) > 1
+    assert tree.node_counts_.min() >= 0
+    proba = tree.predict_proba(X)
+    assert proba.min() >= 0 and proba.max() <= 1
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0)